@@ -5,6 +5,11 @@ from scythe_mcp.music_theory.scales import note_to_midi
 import time
 import random
 
+def _note(pitch: int, start: float, duration: float, velocity: int) -> dict:
+    """Note dict in the format expected by ReaperBridge.add_notes."""
+    return {"pitch": pitch, "start": start, "duration": duration, "velocity": velocity}
+
+
 def demo_piano():
     bridge = ReaperBridge()
     
@@ -25,10 +30,10 @@ def demo_piano():
     # Create Track
     print("3. Creating Piano Track...")
     res = bridge.create_track("Solo Piano")
-    if not res.get("success"):
+    if not res.success:
         print(f"Error creating track: {res}")
         return
-    track_idx = res["track_index"]
+    track_idx = res.track_index
     print(f"Created Track Index: {track_idx}")
     time.sleep(0.5)
     
@@ -49,66 +54,38 @@ def demo_piano():
     current_beat = 0
     beats_per_chord = 4  # Each chord lasts one bar (4 beats)
     
-    for i, chord in enumerate(progression_chords):
-        root_midi = note_to_midi(chord.root, 3)  # Octave 3 for left hand
-        
-        # === LEFT HAND: Simple root + fifth (or root only) ===
-        # Play root on beat 1
-        all_notes.append({
-            "pitch": root_midi - 12,  # Deep bass (octave 2)
-            "start": current_beat,
-            "duration": 3.8,  # Almost full bar
-            "velocity": 80
-        })
-        # Play root again in octave 3
-        all_notes.append({
-            "pitch": root_midi,
-            "start": current_beat,
-            "duration": 3.8,
-            "velocity": 70
-        })
-        
+    # Resolve chord roots once: octave 3 for the left hand, octave 4 for passing-tone targets
+    root_midis = [note_to_midi(chord.root, 3) for chord in progression_chords]
+    next_root_midis = [note_to_midi(chord.root, 4) for chord in progression_chords[1:]]
+    
+    for i, (chord, root_midi) in enumerate(zip(progression_chords, root_midis)):
         # === RIGHT HAND: Chord tones as melody ===
-        # Get the actual notes of the chord (root + intervals)
-        chord_notes = [root_midi + interval for interval in chord.intervals]
-        # Transpose up one octave for melody register
-        melody_notes = [n + 12 for n in chord_notes]  # Now in octave 4
+        # Chord tones transposed up one octave for melody register (octave 4)
+        melody_notes = [root_midi + 12 + interval for interval in chord.intervals]
         
-        # Play chord tones slowly: pick 2-3 notes
-        # Beat 1: Root (octave 4)
-        # Beat 3: Third or Fifth
-        all_notes.append({
-            "pitch": melody_notes[0],  # Root
-            "start": current_beat,
-            "duration": 1.9,  # Half note
-            "velocity": 90
-        })
+        all_notes.extend([
+            # === LEFT HAND: Simple root + fifth (or root only) ===
+            # Play root on beat 1, deep bass (octave 2), almost full bar
+            _note(root_midi - 12, current_beat, 3.8, 80),
+            # Play root again in octave 3
+            _note(root_midi, current_beat, 3.8, 70),
+            # Play chord tones slowly: beat 1 is the root (octave 4), half note
+            _note(melody_notes[0], current_beat, 1.9, 90),
+        ])
         
         if len(melody_notes) >= 2:
             # Beat 3: Play the third (usually index 1)
-            all_notes.append({
-                "pitch": melody_notes[1],  # Third
-                "start": current_beat + 2,
-                "duration": 1.9,
-                "velocity": 85
-            })
+            all_notes.append(_note(melody_notes[1], current_beat + 2, 1.9, 85))
         
         # Optional: every 2 bars, add a passing tone on beat 4 to connect
         if i % 2 == 1 and i < len(progression_chords) - 1:
-            next_chord = progression_chords[i + 1]
-            next_root = note_to_midi(next_chord.root, 4)
+            next_root = next_root_midis[i]
             # Passing tone: halfway between current root and next root
             current_melody_root = melody_notes[0]
             if next_root != current_melody_root:
                 # Simple approach: go one step toward next root
                 direction = 1 if next_root > current_melody_root else -1
-                passing_note = current_melody_root + direction
-                all_notes.append({
-                    "pitch": passing_note,
-                    "start": current_beat + 3.5,
-                    "duration": 0.4,
-                    "velocity": 65
-                })
+                all_notes.append(_note(current_melody_root + direction, current_beat + 3.5, 0.4, 65))
         
         current_beat += beats_per_chord
     
@@ -4,13 +4,14 @@ Scythe MCP - Bassline Generator
 Generate basslines from chord progressions with genre-specific styles.
 """
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 import random
 
 from ..music_theory.scales import Scale
 from ..music_theory.chords import Chord
-from ..music_theory.rhythm import Note, Rhythm
+from ..music_theory.rhythm import Note, Rhythm, note_columns, notes_to_dicts
 
 
 @dataclass 
@@ -23,28 +24,31 @@ class Bassline:
     
     def to_dict_list(self) -> List[Dict]:
         """Convert to list of dicts for MCP transport."""
-        return [
-            {
-                "pitch": n.pitch,
-                "start": n.start,
-                "duration": n.duration,
-                "velocity": n.velocity
-            }
-            for n in self.notes
-        ]
+        return notes_to_dicts(self.notes)
+    
+    def to_soa(self) -> Tuple[List[int], List[float], List[float], List[int]]:
+        """Notes as parallel (pitches, starts, durations, velocities) columns."""
+        starts, durations, velocities, pitches = note_columns(self.notes)
+        return pitches, starts, durations, velocities
+
+
+def _bass_roots(chords: List[Chord], octave_offset: int) -> List[int]:
+    """Root MIDI note of each chord, shifted by the octave offset."""
+    shift = octave_offset * 12
+    return [chord.root_midi + shift for chord in chords]
 
 
 def _root_notes_only(
     chords: List[Chord],
     beats_per_chord: float = 4.0,
-    octave_offset: int = -2
+    octave_offset: int = -2,
+    rng: Optional[random.Random] = None
 ) -> List[Note]:
     """Simple root note bassline."""
     notes = []
     position = 0.0
     
-    for chord in chords:
-        root_midi = chord.root_midi + (octave_offset * 12)
+    for root_midi in _bass_roots(chords, octave_offset):
         notes.append(Note(
             start=position,
             duration=beats_per_chord * 0.9,
@@ -59,14 +63,14 @@ def _root_notes_only(
 def _root_fifth_pattern(
     chords: List[Chord],
     beats_per_chord: float = 4.0,
-    octave_offset: int = -2
+    octave_offset: int = -2,
+    rng: Optional[random.Random] = None
 ) -> List[Note]:
     """Root on 1, fifth on 3 pattern."""
     notes = []
     position = 0.0
     
-    for chord in chords:
-        root_midi = chord.root_midi + (octave_offset * 12)
+    for root_midi in _bass_roots(chords, octave_offset):
         fifth_midi = root_midi + 7  # Perfect fifth
         
         # Root on beat 1
@@ -93,36 +97,39 @@ def _root_fifth_pattern(
 def _walking_bass(
     chords: List[Chord],
     beats_per_chord: float = 4.0,
-    octave_offset: int = -2
+    octave_offset: int = -2,
+    rng: Optional[random.Random] = None
 ) -> List[Note]:
     """Jazz/blues walking bass pattern."""
+    rng = rng or random
     notes = []
     position = 0.0
     
-    for i, chord in enumerate(chords):
-        root_midi = chord.root_midi + (octave_offset * 12)
-        chord_notes = [root_midi + interval for interval in chord.intervals]
-        
-        # Get target note (root of next chord)
-        next_chord = chords[(i + 1) % len(chords)]
-        target = next_chord.root_midi + (octave_offset * 12)
-        
-        # Walking pattern: root, chord tone, passing tone, approach
-        pattern = [
-            root_midi,
-            random.choice(chord_notes),
-            root_midi + random.choice([2, 3, 5]),
-            target - 1 if random.random() < 0.5 else target + 1
-        ]
-        
-        for beat, pitch in enumerate(pattern):
-            notes.append(Note(
-                start=position + beat,
-                duration=0.9,
-                velocity=100 if beat == 0 else 85,
-                pitch=pitch
-            ))
-        
+    # Draw every random choice for the whole line up front
+    # Chord tones are picked as intervals so no per-chord note list is built
+    tone_intervals = [rng.choice(chord.intervals) for chord in chords]
+    passing_steps = rng.choices([2, 3, 5], k=len(chords))
+    approach_signs = rng.choices([-1, 1], k=len(chords))
+    
+    roots = _bass_roots(chords, octave_offset)
+    # Target note is the root of the next chord (wrapping to the first)
+    targets = roots[1:] + roots[:1]
+    
+    # Walking pattern as four pitch columns: root, chord tone, passing tone,
+    # approach (a half step above or below the target, no branching)
+    columns = zip(
+        roots,
+        [root + interval for root, interval in zip(roots, tone_intervals)],
+        [root + step for root, step in zip(roots, passing_steps)],
+        [target + sign for target, sign in zip(targets, approach_signs)],
+    )
+    beat_velocities = (100, 85, 85, 85)
+    
+    for pattern in columns:
+        notes.extend(
+            Note(start=position + beat, duration=0.9, velocity=velocity, pitch=pitch)
+            for beat, (pitch, velocity) in enumerate(zip(pattern, beat_velocities))
+        )
         position += beats_per_chord
     
     return notes
@@ -131,9 +138,11 @@ def _walking_bass(
 def _synth_bass(
     chords: List[Chord],
     beats_per_chord: float = 4.0,
-    octave_offset: int = -2
+    octave_offset: int = -2,
+    rng: Optional[random.Random] = None
 ) -> List[Note]:
     """Electronic synth bass with rhythmic variation."""
+    rng = rng or random
     notes = []
     position = 0.0
     
@@ -142,11 +151,9 @@ def _synth_bass(
         [0.0, 1.0, 2.5, 3.0],               # Sparse
         [0.0, 0.5, 1.0, 2.0, 2.5, 3.0],     # 16th feel
     ]
-    pattern = random.choice(patterns)
+    pattern = rng.choice(patterns)
     
-    for chord in chords:
-        root_midi = chord.root_midi + (octave_offset * 12)
-        
+    for root_midi in _bass_roots(chords, octave_offset):
         for beat_offset in pattern:
             notes.append(Note(
                 start=position + beat_offset,
@@ -163,32 +170,25 @@ def _synth_bass(
 def _octave_bass(
     chords: List[Chord],
     beats_per_chord: float = 4.0,
-    octave_offset: int = -2
+    octave_offset: int = -2,
+    rng: Optional[random.Random] = None
 ) -> List[Note]:
     """Disco/funk octave bass pattern."""
-    notes = []
-    position = 0.0
+    # Per-beat grid: low note on the beat, high octave on the "and"
+    beat_offsets = range(int(beats_per_chord))
+    roots = _bass_roots(chords, octave_offset)
     
-    for chord in chords:
-        root_midi = chord.root_midi + (octave_offset * 12)
-        
-        for beat in range(int(beats_per_chord)):
-            # Low note
-            notes.append(Note(
-                start=position + beat,
-                duration=0.2,
-                velocity=100,
-                pitch=root_midi
-            ))
-            # High octave
-            notes.append(Note(
-                start=position + beat + 0.5,
-                duration=0.2,
-                velocity=80,
-                pitch=root_midi + 12
-            ))
-        
-        position += beats_per_chord
+    notes = []
+    for i, root_midi in enumerate(roots):
+        position = i * beats_per_chord
+        notes.extend(
+            note
+            for beat in beat_offsets
+            for note in (
+                Note(start=position + beat, duration=0.2, velocity=100, pitch=root_midi),
+                Note(start=position + beat + 0.5, duration=0.2, velocity=80, pitch=root_midi + 12),
+            )
+        )
     
     return notes
 
@@ -196,22 +196,23 @@ def _octave_bass(
 def _trap_808(
     chords: List[Chord],
     beats_per_chord: float = 4.0,
-    octave_offset: int = -3  # Lower for 808
+    octave_offset: int = -3,  # Lower for 808
+    rng: Optional[random.Random] = None
 ) -> List[Note]:
     """Trap 808 bass with slides."""
+    rng = rng or random
     notes = []
     position = 0.0
     
-    for chord in chords:
-        root_midi = chord.root_midi + (octave_offset * 12)
-        
-        # Long sustaining 808 hits
-        patterns = [
-            [(0.0, 3.0), (3.0, 0.9)],
-            [(0.0, 1.5), (1.75, 2.0)],
-            [(0.0, 4.0)],
-        ]
-        pattern = random.choice(patterns)
+    # Long sustaining 808 hits, one pattern drawn per chord
+    patterns = [
+        [(0.0, 3.0), (3.0, 0.9)],
+        [(0.0, 1.5), (1.75, 2.0)],
+        [(0.0, 4.0)],
+    ]
+    chord_patterns = rng.choices(patterns, k=len(chords))
+    
+    for root_midi, pattern in zip(_bass_roots(chords, octave_offset), chord_patterns):
         
         for start, duration in pattern:
             notes.append(Note(
@@ -226,6 +227,23 @@ def _trap_808(
     return notes
 
 
+@lru_cache(maxsize=512)
+def _chord_at_octave(root: str, chord_type: str, octave: int) -> Chord:
+    """Shared Chord instance for a root/type/octave combination."""
+    return Chord(root=root, chord_type=chord_type, octave=octave)
+
+
+@lru_cache(maxsize=64)
+def _seeded_bass_notes(
+    generator,
+    chords: Tuple[Chord, ...],
+    beats_per_chord: float,
+    seed: int
+) -> Tuple[Note, ...]:
+    """Deterministic bass notes for a seed."""
+    return tuple(generator(list(chords), beats_per_chord, 0, random.Random(seed)))
+
+
 # Style mapping
 BASS_STYLES = {
     "root": _root_notes_only,
@@ -241,7 +259,9 @@ def generate_bassline(
     chords: List[Chord],
     style: str = "root_fifth",
     beats_per_chord: float = 4.0,
-    octave: int = 2
+    octave: int = 2,
+    seed: Optional[int] = None,
+    rng: Optional[random.Random] = None
 ) -> Bassline:
     """
     Generate a bassline from a chord progression.
@@ -251,22 +271,26 @@ def generate_bassline(
         style: Bass style (root, root_fifth, walking, synth, octave, 808)
         beats_per_chord: Duration of each chord in beats
         octave: Bass octave (default 2)
+        seed: Optional random seed. Seeded basslines are reproducible and cached.
+        rng: Random generator to draw from when no seed is given
+            (defaults to the shared random module)
     
     Returns:
         Bassline object with generated notes
     """
-    # Adjust chord octaves
+    # Adjust chord octaves (generators only read root and intervals)
     adjusted_chords = [
-        Chord(
-            root=c.root,
-            chord_type=c.chord_type,
-            octave=octave
-        )
+        c if c.octave == octave else _chord_at_octave(c.root, c.chord_type, octave)
         for c in chords
     ]
     
-    generator = BASS_STYLES.get(style.lower(), _root_fifth_pattern)
-    notes = generator(adjusted_chords, beats_per_chord, 0)
+    # Exact match first; only lowercase the style name on a miss
+    generator = BASS_STYLES.get(style) or BASS_STYLES.get(style.lower(), _root_fifth_pattern)
+    if seed is None:
+        notes = generator(adjusted_chords, beats_per_chord, 0, rng)
+    else:
+        # Copy so callers can't alter the cached notes
+        notes = list(_seeded_bass_notes(generator, tuple(adjusted_chords), beats_per_chord, seed))
     
     return Bassline(
         notes=notes,
@@ -4,8 +4,9 @@ Scythe MCP - Drum Pattern Generator
 Genre-specific drum patterns for electronic, hip-hop, rock, and more.
 """
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 import random
 
 from ..music_theory.rhythm import Note, Rhythm
@@ -51,25 +52,38 @@ class DrumPattern:
     time_signature: tuple
     tracks: Dict[str, Rhythm]  # instrument -> rhythm
     
-    def to_midi_notes(self, drum_map: Dict[str, int] = None) -> List[Dict]:
-        """Convert all tracks to MIDI note list."""
+    def _sorted_events(self, drum_map: Dict[str, int] = None) -> List[Tuple[float, int, float, int]]:
+        """(start, pitch, duration, velocity) for every hit, in time order."""
         if drum_map is None:
             drum_map = DRUM_MAP
         
+        # Collect tuples so the sort compares them directly instead of
+        # calling a key function
         all_notes = []
         for instrument, rhythm in self.tracks.items():
             pitch = drum_map.get(instrument, 36)
-            for note in rhythm.notes:
-                all_notes.append({
-                    "pitch": pitch,
-                    "start": note.start,
-                    "duration": note.duration,
-                    "velocity": note.velocity
-                })
+            all_notes += [(n.start, pitch, n.duration, n.velocity) for n in rhythm.notes]
         
-        # Sort by start time
-        all_notes.sort(key=lambda n: n["start"])
+        # Sort by start time (ties ordered by pitch)
+        all_notes.sort()
         return all_notes
+    
+    def to_midi_notes(self, drum_map: Dict[str, int] = None) -> List[Dict]:
+        """Convert all tracks to MIDI note list."""
+        return [
+            {"pitch": p, "start": s, "duration": d, "velocity": v}
+            for s, p, d, v in self._sorted_events(drum_map)
+        ]
+    
+    def to_soa(self, drum_map: Dict[str, int] = None) -> Tuple[List[int], List[float], List[float], List[int]]:
+        """All tracks as parallel (pitches, starts, durations, velocities) columns."""
+        events = self._sorted_events(drum_map)
+        return (
+            [e[1] for e in events],
+            [e[0] for e in events],
+            [e[2] for e in events],
+            [e[3] for e in events],
+        )
 
 
 # =============================================================================
@@ -78,26 +92,34 @@ class DrumPattern:
 
 def _create_four_on_floor(bars: int = 4, velocity: int = 100) -> Rhythm:
     """Classic house/techno kick pattern."""
-    notes = []
-    for bar in range(bars):
-        for beat in range(4):
-            notes.append(Note(
-                start=bar * 4 + beat,
-                duration=0.25,
-                velocity=velocity,
-                pitch=DRUM_MAP["kick"]
-            ))
+    kick = DRUM_MAP["kick"]
+    notes = [
+        Note(start=beat, duration=0.25, velocity=velocity, pitch=kick)
+        for beat in range(bars * 4)
+    ]
     return Rhythm((4, 4), notes, bars * 4)
 
 
-def _create_boom_bap_kick(bars: int = 4, velocity: int = 100) -> Rhythm:
+# Boom bap kick positions within one bar
+BOOM_BAP_KICK_PATTERNS = (
+    (0.0, 1.75, 3.0),           # Classic
+    (0.0, 0.75, 2.75),          # Variation 1
+    (0.0, 1.5, 2.5, 3.5),       # Variation 2
+)
+
+
+def _create_boom_bap_kick(
+    bars: int = 4,
+    velocity: int = 100,
+    rng: Optional[random.Random] = None
+) -> Rhythm:
     """Hip-hop boom bap kick pattern."""
-    patterns = [
-        [0.0, 1.75, 3.0],           # Classic
-        [0.0, 0.75, 2.75],          # Variation 1
-        [0.0, 1.5, 2.5, 3.5],       # Variation 2
-    ]
-    pattern = random.choice(patterns)
+    rng = rng or random
+    pattern = rng.choice(BOOM_BAP_KICK_PATTERNS)
+    kick = DRUM_MAP["kick"]
+    
+    # Draw all velocity jitter up front instead of once per hit
+    jitter = iter(rng.choices(range(-5, 6), k=bars * len(pattern)))
     
     notes = []
     for bar in range(bars):
@@ -105,82 +127,73 @@ def _create_boom_bap_kick(bars: int = 4, velocity: int = 100) -> Rhythm:
             notes.append(Note(
                 start=bar * 4 + pos,
                 duration=0.25,
-                velocity=velocity + random.randint(-5, 5),
-                pitch=DRUM_MAP["kick"]
+                velocity=velocity + next(jitter),
+                pitch=kick
             ))
     return Rhythm((4, 4), notes, bars * 4)
 
 
-def _create_trap_hihat(bars: int = 4, velocity: int = 80) -> Rhythm:
+def _create_trap_hihat(
+    bars: int = 4,
+    velocity: int = 80,
+    rng: Optional[random.Random] = None
+) -> Rhythm:
     """Trap-style hihat with rolls."""
+    rng = rng or random
+    hat = DRUM_MAP["closed_hat"]
     notes = []
     
-    for bar in range(bars):
-        for beat in range(4):
-            # Regular eighth notes
-            for eighth in range(2):
-                pos = bar * 4 + beat + (eighth * 0.5)
-                notes.append(Note(
-                    start=pos,
-                    duration=0.125,
-                    velocity=velocity - (eighth * 10),
-                    pitch=DRUM_MAP["closed_hat"]
-                ))
-            
-            # Occasional triplet rolls
-            if random.random() < 0.25:
-                for triplet in range(3):
-                    pos = bar * 4 + beat + (triplet / 6) + 0.5
-                    notes.append(Note(
-                        start=pos,
-                        duration=0.08,
-                        velocity=velocity - 20,
-                        pitch=DRUM_MAP["closed_hat"]
-                    ))
+    # One bit per beat; ANDing two random words sets each bit with p = 0.25
+    num_beats = bars * 4
+    rolls = rng.getrandbits(num_beats) & rng.getrandbits(num_beats)
+    
+    # Beats are numbered across the whole pattern (bar * 4 + beat)
+    for beat in range(num_beats):
+        # Regular eighth notes
+        notes.append(Note(beat, 0.125, velocity, hat))
+        notes.append(Note(beat + 0.5, 0.125, velocity - 10, hat))
+        
+        # Occasional triplet rolls
+        if rolls >> beat & 1:
+            notes.extend(
+                Note(beat + (triplet / 6) + 0.5, 0.08, velocity - 20, hat)
+                for triplet in range(3)
+            )
     
     return Rhythm((4, 4), notes, bars * 4)
 
 
 def _create_backbeat_snare(bars: int = 4, velocity: int = 100) -> Rhythm:
     """Standard backbeat snare on 2 and 4."""
-    notes = []
-    for bar in range(bars):
-        for beat in [1, 3]:  # 2 and 4 (0-indexed)
-            notes.append(Note(
-                start=bar * 4 + beat,
-                duration=0.25,
-                velocity=velocity,
-                pitch=DRUM_MAP["snare"]
-            ))
+    snare = DRUM_MAP["snare"]
+    notes = [
+        Note(start=bar * 4 + beat, duration=0.25, velocity=velocity, pitch=snare)
+        for bar in range(bars)
+        for beat in (1, 3)  # 2 and 4 (0-indexed)
+    ]
     return Rhythm((4, 4), notes, bars * 4)
 
 
 def _create_offbeat_hat(bars: int = 4, velocity: int = 70) -> Rhythm:
     """Offbeat hi-hat pattern (disco/house)."""
-    notes = []
-    for bar in range(bars):
-        for beat in range(4):
-            notes.append(Note(
-                start=bar * 4 + beat + 0.5,
-                duration=0.25,
-                velocity=velocity,
-                pitch=DRUM_MAP["open_hat"]
-            ))
+    open_hat = DRUM_MAP["open_hat"]
+    notes = [
+        Note(start=beat + 0.5, duration=0.25, velocity=velocity, pitch=open_hat)
+        for beat in range(bars * 4)
+    ]
     return Rhythm((4, 4), notes, bars * 4)
 
 
 def _create_eighth_hat(bars: int = 4, velocity: int = 65) -> Rhythm:
     """Straight eighth note hi-hats."""
-    notes = []
-    for bar in range(bars):
-        for beat in range(4):
-            for eighth in range(2):
-                notes.append(Note(
-                    start=bar * 4 + beat + (eighth * 0.5),
-                    duration=0.2,
-                    velocity=velocity if eighth == 0 else velocity - 15,
-                    pitch=DRUM_MAP["closed_hat"]
-                ))
+    # One beat's worth of (offset, velocity), expanded across the pattern
+    steps = [(0.0, velocity), (0.5, velocity - 15)]
+    hat = DRUM_MAP["closed_hat"]
+    notes = [
+        Note(start=beat + offset, duration=0.2, velocity=vel, pitch=hat)
+        for beat in range(bars * 4)
+        for offset, vel in steps
+    ]
     return Rhythm((4, 4), notes, bars * 4)
 
 
@@ -188,30 +201,15 @@ def _create_eighth_hat(bars: int = 4, velocity: int = 65) -> Rhythm:
 # MAIN GENERATOR
 # =============================================================================
 
-def generate_drum_pattern(
-    genre: str = "electronic",
-    bars: int = 4,
-    bpm: float = 120,
-    variation: str = "basic",
-    swing: float = 0.0
-) -> DrumPattern:
-    """
-    Generate a drum pattern for a specific genre.
-    
-    Args:
-        genre: Genre (electronic, hiphop, rock, lofi, trap, etc.)
-        bars: Number of bars
-        bpm: Tempo
-        variation: Pattern variation (basic, complex, minimal, etc.)
-        swing: Swing amount (0.0 to 0.5)
-    
-    Returns:
-        DrumPattern with all instrument tracks
-    """
+def _build_tracks(
+    genre: str,
+    bars: int,
+    swing: float,
+    rng: Optional[random.Random] = None
+) -> Dict[str, Rhythm]:
+    """Build the instrument tracks for a (lowercase) genre."""
     tracks = {}
     
-    genre = genre.lower()
-    
     if genre in ("electronic", "house", "techno"):
         tracks["kick"] = _create_four_on_floor(bars)
         tracks["snare"] = _create_backbeat_snare(bars, 90)
@@ -219,15 +217,15 @@ def generate_drum_pattern(
         tracks["open_hat"] = _create_offbeat_hat(bars)
         
     elif genre in ("hiphop", "hip-hop", "boom_bap", "lofi"):
-        tracks["kick"] = _create_boom_bap_kick(bars)
+        tracks["kick"] = _create_boom_bap_kick(bars, rng=rng)
         tracks["snare"] = _create_backbeat_snare(bars)
         tracks["closed_hat"] = _create_eighth_hat(bars, 55)
         swing = max(swing, 0.15)  # Lo-fi needs swing
         
     elif genre == "trap":
-        tracks["kick"] = _create_boom_bap_kick(bars)
+        tracks["kick"] = _create_boom_bap_kick(bars, rng=rng)
         tracks["snare"] = _create_backbeat_snare(bars, 110)
-        tracks["closed_hat"] = _create_trap_hihat(bars)
+        tracks["closed_hat"] = _create_trap_hihat(bars, rng=rng)
         
     elif genre in ("rock", "punk", "emo"):
         tracks["kick"] = _create_four_on_floor(bars, 110)
@@ -250,6 +248,48 @@ def generate_drum_pattern(
         for name, rhythm in tracks.items():
             tracks[name] = rhythm.with_swing(swing)
     
+    return tracks
+
+
+@lru_cache(maxsize=64)
+def _seeded_tracks(genre: str, bars: int, swing: float, seed: int) -> Dict[str, Rhythm]:
+    """Deterministic tracks for a seed. bpm and variation don't affect notes."""
+    return _build_tracks(genre, bars, swing, random.Random(seed))
+
+
+def generate_drum_pattern(
+    genre: str = "electronic",
+    bars: int = 4,
+    bpm: float = 120,
+    variation: str = "basic",
+    swing: float = 0.0,
+    seed: Optional[int] = None,
+    rng: Optional[random.Random] = None
+) -> DrumPattern:
+    """
+    Generate a drum pattern for a specific genre.
+    
+    Args:
+        genre: Genre (electronic, hiphop, rock, lofi, trap, etc.)
+        bars: Number of bars
+        bpm: Tempo
+        variation: Pattern variation (basic, complex, minimal, etc.)
+        swing: Swing amount (0.0 to 0.5)
+        seed: Optional random seed. Seeded patterns are reproducible and cached.
+        rng: Random generator to draw from when no seed is given
+            (defaults to the shared random module)
+    
+    Returns:
+        DrumPattern with all instrument tracks
+    """
+    genre = genre.lower()
+    
+    if seed is None:
+        tracks = _build_tracks(genre, bars, swing, rng)
+    else:
+        # Copy so callers can't alter the cached mapping
+        tracks = dict(_seeded_tracks(genre, bars, swing, seed))
+    
     return DrumPattern(
         name=f"{genre}_{variation}",
         bars=bars,
@@ -6,12 +6,14 @@ Generate melodies based on scales, chords, and stylistic patterns.
 
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
+from functools import lru_cache
 import random
 import math
+from itertools import accumulate
 
 from ..music_theory.scales import Scale
 from ..music_theory.chords import Chord
-from ..music_theory.rhythm import Note, Rhythm
+from ..music_theory.rhythm import Note, Rhythm, note_columns, notes_to_dicts
 
 
 @dataclass
@@ -25,20 +27,18 @@ class Melody:
     
     def to_dict_list(self) -> List[Dict]:
         """Convert to list of dicts for MCP transport."""
-        return [
-            {
-                "pitch": n.pitch,
-                "start": n.start,
-                "duration": n.duration,
-                "velocity": n.velocity
-            }
-            for n in self.notes
-        ]
+        return notes_to_dicts(self.notes)
+    
+    def to_soa(self) -> Tuple[List[int], List[float], List[float], List[int]]:
+        """Notes as parallel (pitches, starts, durations, velocities) columns."""
+        starts, durations, velocities, pitches = note_columns(self.notes)
+        return pitches, starts, durations, velocities
 
 
 def _generate_contour(
     length: int,
-    style: str = "arch"
+    style: str = "arch",
+    rng: Optional[random.Random] = None
 ) -> List[int]:
     """
     Generate a melodic contour (relative direction hints).
@@ -54,15 +54,10 @@ def _generate_contour(
     elif style == "ascending":
         contour = [1] * length
     elif style == "wave":
-        contour = []
-        for i in range(length):
-            phase = (i % 4)
-            if phase < 2:
-                contour.append(1)
-            else:
-                contour.append(-1)
+        # Two steps up, two steps down, tiled to length
+        contour = ([1, 1, -1, -1] * (length // 4 + 1))[:length]
     else:  # random
-        contour = [random.choice([-1, 0, 0, 1]) for _ in range(length)]
+        contour = (rng or random).choices([-1, 0, 0, 1], k=length)
     
     return contour
 
@@ -71,41 +66,43 @@ def _apply_contour_to_scale(
     scale: Scale,
     contour: List[int],
     start_degree: int = 1,
-    octave_range: Tuple[int, int] = (-1, 1)
+    octave_range: Tuple[int, int] = (-1, 1),
+    rng: Optional[random.Random] = None
 ) -> List[int]:
     """Convert contour to actual MIDI notes using scale degrees."""
-    notes = []
-    current_degree = start_degree
+    rng = rng or random
+    num_notes = len(scale.intervals)
+    lowest = 1 + (num_notes * octave_range[0])
+    highest = num_notes * (1 + octave_range[1])
     
-    for direction in contour:
+    def step(current_degree: int, direction: int) -> int:
         # Move by scale degree
-        step = direction
         if abs(direction) == 2:
-            step = direction * random.randint(2, 3)  # Larger leap
-        
-        current_degree += step
+            direction *= rng.randint(2, 3)  # Larger leap
+        current_degree += direction
         
         # Keep within range
-        num_notes = len(scale.intervals)
-        while current_degree > num_notes * (1 + octave_range[1]):
+        while current_degree > highest:
             current_degree -= num_notes
-        while current_degree < 1 + (num_notes * octave_range[0]):
+        while current_degree < lowest:
             current_degree += num_notes
-        
-        midi_note = scale.degree_to_midi(current_degree)
-        notes.append(midi_note)
+        return current_degree
     
-    return notes
+    # Running scan over the contour, dropping the seed degree
+    degrees = list(accumulate(contour, step, initial=start_degree))[1:]
+    return scale.degrees_to_midi(degrees)
 
 
 def _generate_rhythm_pattern(
     beats: float,
     density: float = 0.5,
-    style: str = "varied"
+    style: str = "varied",
+    rng: Optional[random.Random] = None
 ) -> List[Tuple[float, float]]:
     """
     Generate rhythm pattern as (start, duration) tuples.
     """
+    rng = rng or random
     positions = []
     
     if style == "straight":
@@ -113,7 +110,7 @@ def _generate_rhythm_pattern(
         note_length = 1.0 if density > 0.5 else 2.0
         pos = 0.0
         while pos < beats:
-            dur = note_length * random.uniform(0.8, 1.0)
+            dur = note_length * rng.uniform(0.8, 1.0)
             positions.append((pos, dur))
             pos += note_length
             
@@ -121,21 +118,21 @@ def _generate_rhythm_pattern(
         # Off-beat emphasis
         pos = 0.0
         while pos < beats:
-            if random.random() < 0.3:
+            if rng.random() < 0.3:
                 pos += 0.5  # Offset start
             
-            dur = random.choice([0.5, 0.75, 1.0, 1.5])
+            dur = rng.choice([0.5, 0.75, 1.0, 1.5])
             if pos + dur <= beats:
                 positions.append((pos, dur))
             
-            pos += random.choice([0.5, 1.0, 1.5])
+            pos += rng.choice([0.5, 1.0, 1.5])
             
     elif style == "lyrical":
         # Smooth, on-beat, longer notes for ballads
         pos = 0.0
         while pos < beats:
             # Mostly quarter and half notes, occasional eighths
-            dur = random.choice([1.0, 1.0, 1.5, 2.0, 3.0, 0.5])
+            dur = rng.choice([1.0, 1.0, 1.5, 2.0, 3.0, 0.5])
             
             # Snap position to grid (nearest 0.5) to fix drift
             pos = math.ceil(pos * 2) / 2
@@ -146,30 +143,28 @@ def _generate_rhythm_pattern(
             # Less is More: Add gaps based on density
             # Density 1.0 = no gaps. Density 0.3 = frequent gaps.
             gap = 0
-            if random.random() > density:
+            if rng.random() > density:
                  # Add a rest (1 to 2 beats)
-                 gap = random.choice([1.0, 2.0, 3.0])
+                 gap = rng.choice([1.0, 2.0, 3.0])
             
             pos += dur + gap
             
     else:  # varied
-        pos = 0.0
-        while pos < beats:
-            dur = random.choice([0.25, 0.5, 0.75, 1.0, 1.5, 2.0])
-            # REMOVED: dur *= random.uniform(0.9, 1.0) - This caused accumulated drift!
-            
-            # Start position must be quantized? 
-            # The current logic just adds duration. 
-            # Ideally we pick a start time on the grid.
-            
-            if pos + dur <= beats:
-                # We can shorten the *played* duration (gate) without affecting the *grid* position for the next note
-                write_dur = dur * random.uniform(0.9, 1.0) # Humanize length only
-                positions.append((pos, write_dur))
-            
-            # Gap between notes
-            gap = random.choice([0, 0, 0.25, 0.5]) if density > 0.5 else random.choice([0.25, 0.5, 1.0])
-            pos += dur + gap
+        # Pre-draw enough steps to fill the pattern (shortest step is 0.25)
+        max_steps = int(beats / 0.25) + 1
+        durations = rng.choices([0.25, 0.5, 0.75, 1.0, 1.5, 2.0], k=max_steps)
+        # Gap between notes
+        gap_choices = [0, 0, 0.25, 0.5] if density > 0.5 else [0.25, 0.5, 1.0]
+        gaps = rng.choices(gap_choices, k=max_steps)
+        
+        # Grid positions are a running sum of duration + gap. Only the *played*
+        # duration (gate) is humanized, so the grid never drifts.
+        grid = accumulate((dur + gap for dur, gap in zip(durations, gaps)), initial=0.0)
+        positions = [
+            (pos, dur * rng.uniform(0.9, 1.0))
+            for pos, dur in zip(grid, durations)
+            if pos + dur <= beats
+        ]
     
     return positions
 
@@ -182,7 +177,9 @@ def generate_melody(
     style: str = "varied",
     contour: str = "arch",
     density: float = 0.5,
-    octave: int = 5
+    octave: int = 5,
+    seed: Optional[int] = None,
+    rng: Optional[random.Random] = None
 ) -> Melody:
     """
     Generate a melody based on scale and style.
@@ -196,6 +193,9 @@ def generate_melody(
         contour: Melodic shape (arch, ascending, descending, wave, random)
         density: Note density (0.0 sparse to 1.0 dense)
         octave: Melody octave
+        seed: Optional random seed. Seeded melodies are reproducible and cached.
+        rng: Random generator to draw from when no seed is given
+            (defaults to the shared random module)
     
     Returns:
         Melody object with generated notes
@@ -203,30 +203,67 @@ def generate_melody(
     if scale is None:
         scale = Scale(root=key, scale_type=scale_type, octave=octave)
     
+    if seed is None:
+        notes = _melody_notes(scale, bars, style, contour, density, rng or random)
+    else:
+        # Copy so callers can't alter the cached notes
+        notes = list(_seeded_melody_notes(scale, bars, style, contour, density, seed))
+    
+    return Melody(
+        notes=notes,
+        length_beats=bars * 4,  # Assuming 4/4
+        scale=scale,
+        style=style
+    )
+
+
+@lru_cache(maxsize=64)
+def _seeded_melody_notes(
+    scale: Scale,
+    bars: int,
+    style: str,
+    contour: str,
+    density: float,
+    seed: int
+) -> Tuple[Note, ...]:
+    """Deterministic melody notes for a seed."""
+    return tuple(_melody_notes(scale, bars, style, contour, density, random.Random(seed)))
+
+
+def _melody_notes(
+    scale: Scale,
+    bars: int,
+    style: str,
+    contour: str,
+    density: float,
+    rng
+) -> List[Note]:
+    """Draw rhythm, contour and velocities for a melody from rng."""
     beats = bars * 4  # Assuming 4/4
     
     # Generate rhythm
-    rhythm_pattern = _generate_rhythm_pattern(beats, density, style)
+    rhythm_pattern = _generate_rhythm_pattern(beats, density, style, rng)
     
     if not rhythm_pattern:
         # Fallback to simple pattern
         rhythm_pattern = [(i * 1.0, 0.9) for i in range(bars * 4)]
     
     # Generate pitch contour
-    pitch_contour = _generate_contour(len(rhythm_pattern), contour)
+    pitch_contour = _generate_contour(len(rhythm_pattern), contour, rng)
     
     # Convert to actual pitches
     pitches = _apply_contour_to_scale(
         scale,
         pitch_contour,
-        start_degree=random.choice([1, 3, 5]),  # Start on chord tone
-        octave_range=(-1, 1)
+        start_degree=rng.choice([1, 3, 5]),  # Start on chord tone
+        octave_range=(-1, 1),
+        rng=rng
     )
     
     # Combine rhythm and pitch
     notes = []
     for (start, duration), pitch in zip(rhythm_pattern, pitches):
-        velocity = random.randint(75, 100)
+        velocity = rng.randint(75, 100)
         
         # Accent downbeats
         if start % 1.0 == 0:
@@ -239,12 +276,7 @@ def generate_melody(
             pitch=pitch
         ))
     
-    return Melody(
-        notes=notes,
-        length_beats=beats,
-        scale=scale,
-        style=style
-    )
+    return notes
 
 
 def generate_arpeggio(
@@ -252,7 +284,8 @@ def generate_arpeggio(
     bars: int = 1,
     pattern: str = "up",
     note_length: float = 0.25,
-    octaves: int = 1
+    octaves: int = 1,
+    rng: Optional[random.Random] = None
 ) -> Melody:
     """
     Generate an arpeggio from a chord.
@@ -263,6 +296,7 @@ def generate_arpeggio(
         pattern: Arpeggio pattern (up, down, up_down, random)
         note_length: Duration of each note
         octaves: Number of octaves to span
+        rng: Random generator for the random pattern (defaults to the shared random module)
     
     Returns:
         Melody object with arpeggio notes
@@ -270,39 +304,32 @@ def generate_arpeggio(
     chord_notes = chord.get_notes()
     
     # Extend to multiple octaves
-    all_notes = []
-    for oct in range(octaves):
-        for note in chord_notes:
-            all_notes.append(note + (oct * 12))
+    all_notes = [note + (oct * 12) for oct in range(octaves) for note in chord_notes]
     
     # Create pattern sequence
     if pattern == "up":
         sequence = all_notes
     elif pattern == "down":
-        sequence = list(reversed(all_notes))
+        sequence = all_notes[::-1]
     elif pattern == "up_down":
-        sequence = all_notes + list(reversed(all_notes[1:-1]))
+        # Back down without repeating the top and bottom notes
+        sequence = all_notes + all_notes[-2:0:-1]
     else:  # random
         sequence = all_notes.copy()
-        random.shuffle(sequence)
+        (rng or random).shuffle(sequence)
     
-    # Generate notes
-    notes = []
-    position = 0.0
+    # Generate notes on a fixed grid, cycling through the sequence
     beats = bars * 4
-    
-    while position < beats:
-        idx = int((position / note_length) % len(sequence))
-        pitch = sequence[idx]
-        
-        notes.append(Note(
-            start=position,
+    steps = math.ceil(beats / note_length)
+    notes = [
+        Note(
+            start=step * note_length,
             duration=note_length * 0.9,
             velocity=85,
-            pitch=pitch
-        ))
-        
-        position += note_length
+            pitch=sequence[step % len(sequence)]
+        )
+        for step in range(steps)
+    ]
     
     return Melody(
         notes=notes,
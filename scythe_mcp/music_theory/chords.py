@@ -4,59 +4,62 @@ Scythe MCP - Chords
 Chord construction, inversions, extensions, and voice leading.
 """
 
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, Mapping, Tuple, Optional
+from types import MappingProxyType
 from dataclasses import dataclass, field
+from functools import lru_cache
+import re
 from .scales import note_to_midi, midi_to_note, NOTE_NAMES, ENHARMONIC
 
 
 # Chord intervals from root (in semitones)
-CHORD_TYPES: Dict[str, List[int]] = {
+CHORD_TYPES: Mapping[str, Tuple[int, ...]] = MappingProxyType({
     # Triads
-    "major": [0, 4, 7],
-    "minor": [0, 3, 7],
-    "diminished": [0, 3, 6],
-    "augmented": [0, 4, 8],
-    "sus2": [0, 2, 7],
-    "sus4": [0, 5, 7],
+    "major": (0, 4, 7),
+    "minor": (0, 3, 7),
+    "diminished": (0, 3, 6),
+    "augmented": (0, 4, 8),
+    "sus2": (0, 2, 7),
+    "sus4": (0, 5, 7),
     
     # Seventh chords
-    "maj7": [0, 4, 7, 11],
-    "min7": [0, 3, 7, 10],
-    "7": [0, 4, 7, 10],        # Dominant 7
-    "dim7": [0, 3, 6, 9],
-    "m7b5": [0, 3, 6, 10],     # Half-diminished
-    "minmaj7": [0, 3, 7, 11],
-    "aug7": [0, 4, 8, 10],
+    "maj7": (0, 4, 7, 11),
+    "min7": (0, 3, 7, 10),
+    "7": (0, 4, 7, 10),        # Dominant 7
+    "dim7": (0, 3, 6, 9),
+    "m7b5": (0, 3, 6, 10),     # Half-diminished
+    "minmaj7": (0, 3, 7, 11),
+    "aug7": (0, 4, 8, 10),
     
     # Extended chords
-    "9": [0, 4, 7, 10, 14],
-    "maj9": [0, 4, 7, 11, 14],
-    "min9": [0, 3, 7, 10, 14],
-    "11": [0, 4, 7, 10, 14, 17],
-    "min11": [0, 3, 7, 10, 14, 17],
-    "13": [0, 4, 7, 10, 14, 17, 21],
-    "maj13": [0, 4, 7, 11, 14, 17, 21],
+    "9": (0, 4, 7, 10, 14),
+    "maj9": (0, 4, 7, 11, 14),
+    "min9": (0, 3, 7, 10, 14),
+    "11": (0, 4, 7, 10, 14, 17),
+    "min11": (0, 3, 7, 10, 14, 17),
+    "13": (0, 4, 7, 10, 14, 17, 21),
+    "maj13": (0, 4, 7, 11, 14, 17, 21),
     
     # Add chords
-    "add9": [0, 4, 7, 14],
-    "add11": [0, 4, 7, 17],
-    "madd9": [0, 3, 7, 14],
+    "add9": (0, 4, 7, 14),
+    "add11": (0, 4, 7, 17),
+    "madd9": (0, 3, 7, 14),
     
     # Altered chords
-    "7b9": [0, 4, 7, 10, 13],
-    "7#9": [0, 4, 7, 10, 15],
-    "7#11": [0, 4, 7, 10, 18],
-    "7b13": [0, 4, 7, 10, 20],
-    "7alt": [0, 4, 6, 10, 13, 15],  # Altered dominant
+    "7b9": (0, 4, 7, 10, 13),
+    "7#9": (0, 4, 7, 10, 15),
+    "7#11": (0, 4, 7, 10, 18),
+    "7b13": (0, 4, 7, 10, 20),
+    "7alt": (0, 4, 6, 10, 13, 15),  # Altered dominant
     
     # Power chords (common in rock/metal)
-    "5": [0, 7],
-    "power": [0, 7, 12],
+    "5": (0, 7),
+    "power": (0, 7, 12),
     
     # Shoegaze/Dream pop favorites
-    "add9sus4": [0, 5, 7, 14],
-    "7sus4": [0, 5, 7, 10],
-}
+    "add9sus4": (0, 5, 7, 14),
+    "7sus4": (0, 5, 7, 10),
+})
 
 # Chord symbol aliases
 CHORD_ALIASES = {
@@ -74,22 +77,43 @@ CHORD_ALIASES = {
     "o7": "dim7",
 }
 
+# Chord type or alias straight to its intervals, so Chord.intervals is one lookup
+CHORD_TYPE_RESOLVER: Dict[str, Tuple[int, ...]] = {
+    **{alias: CHORD_TYPES[name] for alias, name in CHORD_ALIASES.items() if name in CHORD_TYPES},
+    **CHORD_TYPES,
+}
+
+# Fallback for unknown chord types
+_MAJOR = CHORD_TYPES["major"]
+
+# Root letter (any character, as before), optional accidental, then the quality
+CHORD_PATTERN = re.compile(r"(.)([#b]?)(.*)", re.DOTALL)
+
+# Every lowercase quality string parse_chord understands, mapped to its CHORD_TYPES key.
+# Precedence: exact chord types, then aliases, then "m"-prefixed shorthands ("m7" -> "min7").
+QUALITY_MAP: Dict[str, str] = {name.lower(): name for name in CHORD_TYPES}
+for _alias, _name in CHORD_ALIASES.items():
+    QUALITY_MAP.setdefault(_alias.lower(), _name)
+QUALITY_MAP.setdefault("min", "minor")
+for _name in CHORD_TYPES:
+    if _name.startswith("min"):
+        QUALITY_MAP.setdefault("m" + _name[3:], _name)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class Chord:
-    """Represents a musical chord."""
+    """Represents a musical chord. Immutable, so instances can be cached and shared."""
     
     root: str
     chord_type: str = "major"
     octave: int = 4
     inversion: int = 0
-    voicing: Optional[List[int]] = None
+    voicing: Optional[Tuple[int, ...]] = None
     
     @property
-    def intervals(self) -> List[int]:
+    def intervals(self) -> Tuple[int, ...]:
         """Get the intervals for this chord type."""
-        chord_key = CHORD_ALIASES.get(self.chord_type, self.chord_type)
-        return CHORD_TYPES.get(chord_key, CHORD_TYPES["major"])
+        return CHORD_TYPE_RESOLVER.get(self.chord_type, _MAJOR)
     
     @property
     def root_midi(self) -> int:
@@ -117,8 +141,7 @@ class Chord:
     
     def get_note_names(self) -> List[str]:
         """Get note names for this chord."""
-        midi_notes = self.get_notes()
-        return [midi_to_note(n)[0] for n in midi_notes]
+        return [NOTE_NAMES[n % 12] for n in self.get_notes()]
     
     @property
     def name(self) -> str:
@@ -158,102 +181,75 @@ class Chord:
         return self  # Fallback
 
 
+def inversion_notes(root_midi: int, intervals: Tuple[int, ...]) -> List[List[int]]:
+    """MIDI notes of every inversion of a chord, indexed by inversion."""
+    base_notes = [root_midi + interval for interval in intervals]
+    return [
+        sorted(note + 12 if i < inv else note for i, note in enumerate(base_notes))
+        for inv in range(len(base_notes))
+    ]
+
+
+def voice_leading_distance(from_notes: List[int], to_notes: List[int]) -> int:
+    """Total movement when each note travels to its closest target note."""
+    return sum(min(abs(note - from_note) for note in to_notes) for from_note in from_notes)
+
+
 def voice_lead(from_chord: Chord, to_chord: Chord) -> Chord:
     """
     Apply voice leading to minimize movement between chords.
     Returns a new chord with optimized voicing.
     """
     from_notes = from_chord.get_notes()
-    to_notes = to_chord.get_notes()
-    
-    best_voicing = None
-    min_movement = float('inf')
     
-    # Try all inversions
-    for inv in range(len(to_chord.intervals)):
-        test_chord = Chord(
-            root=to_chord.root,
-            chord_type=to_chord.chord_type,
-            octave=to_chord.octave,
-            inversion=inv
-        )
-        test_notes = test_chord.get_notes()
-        
-        # Calculate total movement
-        movement = 0
-        for from_note in from_notes:
-            closest = min(test_notes, key=lambda n: abs(n - from_note))
-            movement += abs(closest - from_note)
-        
-        if movement < min_movement:
-            min_movement = movement
-            best_voicing = inv
+    movements = [
+        voice_leading_distance(from_notes, notes)
+        for notes in inversion_notes(to_chord.root_midi, to_chord.intervals)
+    ]
+    best_voicing = movements.index(min(movements))
     
     return Chord(
         root=to_chord.root,
         chord_type=to_chord.chord_type,
         octave=to_chord.octave,
-        inversion=best_voicing or 0
+        inversion=best_voicing
     )
 
 
+@lru_cache(maxsize=1024)
 def parse_chord(chord_str: str) -> Chord:
     """
     Parse a chord string like "Cmaj7", "Dm", "F#m7b5".
+    
+    Results are cached per symbol; the returned Chord is immutable.
     """
     chord_str = chord_str.strip()
     if not chord_str:
         return Chord("C", "major")
     
-    # Extract root note
-    root = chord_str[0].upper()
-    idx = 1
-    
-    # Check for sharp/flat
-    if len(chord_str) > 1 and chord_str[1] in '#b':
-        root += chord_str[1]
-        idx = 2
-    
-    # Rest is the chord type
-    chord_type_str = chord_str[idx:].lower() if idx < len(chord_str) else ""
-    
-    # Map to chord type
-    chord_type = "major"
-    if chord_type_str in CHORD_TYPES:
-        chord_type = chord_type_str
-    elif chord_type_str in CHORD_ALIASES:
-        chord_type = CHORD_ALIASES[chord_type_str]
-    elif chord_type_str.startswith("m") and not chord_type_str.startswith("maj"):
-        if chord_type_str in ("m", "min"):
-            chord_type = "minor"
-        else:
-            # Try with 'min' prefix
-            rest = chord_type_str[1:]
-            if f"min{rest}" in CHORD_TYPES:
-                chord_type = f"min{rest}"
-            elif f"m{rest}" in CHORD_TYPES:
-                chord_type = f"m{rest}"
+    letter, accidental, quality = CHORD_PATTERN.fullmatch(chord_str).groups()
+    chord_type = QUALITY_MAP.get(quality.lower(), "major")
     
-    return Chord(root=root, chord_type=chord_type)
+    return Chord(root=letter.upper() + accidental, chord_type=chord_type)
 
 
 # Common chord voicings for different styles
-VOICINGS = {
+VOICINGS: Dict[str, Dict[str, Tuple[int, ...]]] = {
     "open": {
-        "major": [0, 7, 12, 16],  # Root, 5th, octave, 3rd
-        "minor": [0, 7, 12, 15],
+        "major": (0, 7, 12, 16),  # Root, 5th, octave, 3rd
+        "minor": (0, 7, 12, 15),
     },
     "closed": {
-        "major": [0, 4, 7],
-        "minor": [0, 3, 7],
+        "major": (0, 4, 7),
+        "minor": (0, 3, 7),
     },
     "drop2": {
-        "maj7": [0, 7, 11, 16],
-        "min7": [0, 7, 10, 15],
+        "maj7": (0, 7, 11, 16),
+        "min7": (0, 7, 10, 15),
     },
     "shell": {  # Jazz shell voicings (root, 3rd, 7th)
-        "maj7": [0, 4, 11],
-        "min7": [0, 3, 10],
-        "7": [0, 4, 10],
+        "maj7": (0, 4, 11),
+        "min7": (0, 3, 10),
+        "7": (0, 4, 10),
     }
 }
@@ -6,7 +6,11 @@ Common progressions, genre-specific patterns, and modulation helpers.
 
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
-from .chords import Chord, parse_chord, voice_lead
+from functools import lru_cache
+from .scales import NOTE_NAMES, NOTE_TO_IDX, SCALES
+from .chords import (
+    Chord, CHORD_TYPE_RESOLVER, parse_chord, voice_lead, inversion_notes, voice_leading_distance
+)
 
 
 # Roman numeral to scale degree mapping
@@ -28,181 +32,243 @@ MINOR_KEY_CHORDS = {
 }
 
 # Common progressions by genre (in Roman numerals for transposition)
-COMMON_PROGRESSIONS: Dict[str, Dict[str, List[str]]] = {
+COMMON_PROGRESSIONS: Dict[str, Dict[str, Tuple[str, ...]]] = {
     "pop": {
-        "axis": ["I", "V", "vi", "IV"],          # Axis of Awesome
-        "classic": ["I", "IV", "V", "I"],
-        "sensitive": ["vi", "IV", "I", "V"],
-        "doo_wop": ["I", "vi", "IV", "V"],
+        "axis": ("I", "V", "vi", "IV"),          # Axis of Awesome
+        "classic": ("I", "IV", "V", "I"),
+        "sensitive": ("vi", "IV", "I", "V"),
+        "doo_wop": ("I", "vi", "IV", "V"),
     },
     "jazz": {
-        "ii_v_i": ["ii7", "V7", "Imaj7"],
-        "ii_v_i_vi": ["ii7", "V7", "Imaj7", "vi7"],
-        "rhythm_changes_a": ["Imaj7", "vi7", "ii7", "V7"],
-        "minor_ii_v_i": ["iiø7", "V7b9", "i7"],
-        "turnaround": ["Imaj7", "vi7", "ii7", "V7"],
-        "backdoor": ["Imaj7", "bVII7", "Imaj7"],
-        "coltrane": ["Imaj7", "bIIImaj7", "Vmaj7"],  # Giant Steps
+        "ii_v_i": ("ii7", "V7", "Imaj7"),
+        "ii_v_i_vi": ("ii7", "V7", "Imaj7", "vi7"),
+        "rhythm_changes_a": ("Imaj7", "vi7", "ii7", "V7"),
+        "minor_ii_v_i": ("iiø7", "V7b9", "i7"),
+        "turnaround": ("Imaj7", "vi7", "ii7", "V7"),
+        "backdoor": ("Imaj7", "bVII7", "Imaj7"),
+        "coltrane": ("Imaj7", "bIIImaj7", "Vmaj7"),  # Giant Steps
     },
     "blues": {
-        "12_bar": ["I7", "I7", "I7", "I7", "IV7", "IV7", "I7", "I7", "V7", "IV7", "I7", "V7"],
-        "quick_change": ["I7", "IV7", "I7", "I7", "IV7", "IV7", "I7", "I7", "V7", "IV7", "I7", "V7"],
-        "minor_blues": ["i7", "i7", "i7", "i7", "iv7", "iv7", "i7", "i7", "VI7", "V7", "i7", "V7"],
+        "12_bar": ("I7", "I7", "I7", "I7", "IV7", "IV7", "I7", "I7", "V7", "IV7", "I7", "V7"),
+        "quick_change": ("I7", "IV7", "I7", "I7", "IV7", "IV7", "I7", "I7", "V7", "IV7", "I7", "V7"),
+        "minor_blues": ("i7", "i7", "i7", "i7", "iv7", "iv7", "i7", "i7", "VI7", "V7", "i7", "V7"),
     },
     "rock": {
-        "classic": ["I", "IV", "V", "I"],
-        "power": ["I5", "bVII5", "IV5", "I5"],
-        "grunge": ["I", "IV", "bVI", "bVII"],
-        "modal": ["i", "bVII", "bVI", "bVII"],
+        "classic": ("I", "IV", "V", "I"),
+        "power": ("I5", "bVII5", "IV5", "I5"),
+        "grunge": ("I", "IV", "bVI", "bVII"),
+        "modal": ("i", "bVII", "bVI", "bVII"),
     },
     "lofi": {
-        "chill": ["ii7", "V7", "Imaj7", "vi7"],
-        "melancholic": ["i9", "bVI9", "III9", "bVII9"],
-        "jazzy": ["IVmaj7", "iii7", "vi7", "ii7"],
-        "dreamy": ["Imaj7", "ii7", "iii7", "IVmaj7"],
+        "chill": ("ii7", "V7", "Imaj7", "vi7"),
+        "melancholic": ("i9", "bVI9", "III9", "bVII9"),
+        "jazzy": ("IVmaj7", "iii7", "vi7", "ii7"),
+        "dreamy": ("Imaj7", "ii7", "iii7", "IVmaj7"),
     },
     "electronic": {
-        "trance": ["i", "bVI", "bVII", "i"],
-        "house": ["i", "i", "bVI", "bVII"],
-        "edm_drop": ["vi", "IV", "I", "V"],
-        "techno": ["i", "bVII", "bVI", "V"],
+        "trance": ("i", "bVI", "bVII", "i"),
+        "house": ("i", "i", "bVI", "bVII"),
+        "edm_drop": ("vi", "IV", "I", "V"),
+        "techno": ("i", "bVII", "bVI", "V"),
     },
     "shoegaze": {
-        "wall": ["I", "iii", "IV", "ii"],
-        "ethereal": ["Iadd9", "IVadd9", "vi", "V"],
-        "dreamy": ["I", "bVII", "IV", "I"],
+        "wall": ("I", "iii", "IV", "ii"),
+        "ethereal": ("Iadd9", "IVadd9", "vi", "V"),
+        "dreamy": ("I", "bVII", "IV", "I"),
     },
     "dreampop": {
-        "lush": ["Imaj7", "IVmaj7add9", "vi7", "IV"],
-        "nostalgic": ["I", "vi", "IV", "iii"],
+        "lush": ("Imaj7", "IVmaj7add9", "vi7", "IV"),
+        "nostalgic": ("I", "vi", "IV", "iii"),
     },
     "emo": {
-        "classic": ["I", "vi", "IV", "V"],
-        "midwest": ["I", "V", "vi", "IV"],
-        "post": ["i", "III", "bVII", "IV"],
+        "classic": ("I", "vi", "IV", "V"),
+        "midwest": ("I", "V", "vi", "IV"),
+        "post": ("i", "III", "bVII", "IV"),
     },
     "folk": {
-        "simple": ["I", "IV", "V", "I"],
-        "storytelling": ["I", "V", "vi", "IV"],
-        "modal": ["i", "bVII", "i", "iv"],
+        "simple": ("I", "IV", "V", "I"),
+        "storytelling": ("I", "V", "vi", "IV"),
+        "modal": ("i", "bVII", "i", "iv"),
     },
     "chiptune": {
-        "heroic": ["I", "IV", "V", "I"],
-        "boss_battle": ["i", "bVI", "bVII", "i"],
-        "victory": ["I", "IV", "I", "V", "I"],
+        "heroic": ("I", "IV", "V", "I"),
+        "boss_battle": ("i", "bVI", "bVII", "i"),
+        "victory": ("I", "IV", "I", "V", "I"),
     },
     "ambient": {
-        "drone": ["I", "I", "I", "I"],  # Static harmony
-        "evolving": ["Imaj7", "IVmaj7", "Imaj7", "Vmaj7"],
-        "cinematic": ["i", "bVI", "IV", "i"],
+        "drone": ("I", "I", "I", "I"),  # Static harmony
+        "evolving": ("Imaj7", "IVmaj7", "Imaj7", "Vmaj7"),
+        "cinematic": ("i", "bVI", "IV", "i"),
     },
 }
 
 
-@dataclass
+def _compile_numeral(numeral: str, scale_intervals: Tuple[int, ...]) -> Tuple[int, str]:
+    """Parse a Roman numeral chord symbol into (semitones above the key, chord type)."""
+    # Handle flats/sharps
+    modifier = 0
+    if numeral.startswith('b'):
+        modifier = -1
+        numeral = numeral[1:]
+    elif numeral.startswith('#'):
+        modifier = 1
+        numeral = numeral[1:]
+    
+    # Extract base numeral
+    base_numeral = ""
+    for char in numeral:
+        if char.upper() in "IVX":
+            base_numeral += char
+        else:
+            break
+    
+    remainder = numeral[len(base_numeral):]
+    
+    # Get scale degree
+    degree = ROMAN_NUMERALS.get(base_numeral.upper(), 1)
+    is_minor = base_numeral.islower()
+    
+    # Root offset from the key
+    offset = scale_intervals[degree - 1] + modifier
+    
+    # Determine chord quality
+    if remainder:
+        # Explicit chord type in Roman numeral
+        chord_type = remainder.replace("ø", "m7b5").lower()
+        if chord_type == "7" and is_minor:
+            chord_type = "min7"
+    else:
+        # Infer from numeral case
+        chord_type = "minor" if is_minor else "major"
+    
+    return offset, chord_type
+
+
+@lru_cache(maxsize=256)
+def _compile_progression(numerals: Tuple[str, ...], mode: str) -> Tuple[Tuple[int, str], ...]:
+    """Key-independent (offset, chord type) pairs for a progression's numerals."""
+    scale_intervals = SCALES["major"] if mode == "major" else SCALES["natural_minor"]
+    return tuple(_compile_numeral(numeral, scale_intervals) for numeral in numerals)
+
+
+# Precompile the built-in progressions at import so lookups never parse numerals
+for _genre_progs in COMMON_PROGRESSIONS.values():
+    for _numerals in _genre_progs.values():
+        for _mode in ("major", "minor"):
+            _compile_progression(_numerals, _mode)
+
+
+@lru_cache(maxsize=256)
+def _resolve_progression(
+    key: str,
+    mode: str,
+    numerals: Tuple[str, ...],
+    octave: int
+) -> Tuple[Chord, ...]:
+    """Chords of a progression in a key and octave. Cached."""
+    key_idx = NOTE_TO_IDX.get(key.upper(), 0)
+    
+    # Numerals are parsed once per (numerals, mode); transposing is one add
+    return tuple(
+        Chord(root=NOTE_NAMES[(key_idx + offset) % 12], chord_type=chord_type, octave=octave)
+        for offset, chord_type in _compile_progression(numerals, mode)
+    )
+
+
+@dataclass(slots=True, frozen=True)
 class Progression:
-    """Represents a chord progression."""
+    """Represents a chord progression. Immutable and hashable."""
     
     key: str
     mode: str  # "major" or "minor"
-    chords: List[str]  # Roman numerals or chord names
+    chords: Tuple[str, ...]  # Roman numerals or chord names
     bars_per_chord: int = 1
     
+    def __post_init__(self):
+        # Accept any sequence of numerals but store a tuple so the instance hashes
+        object.__setattr__(self, "chords", tuple(self.chords))
+    
     def to_chords(self, octave: int = 4) -> List[Chord]:
         """Convert Roman numerals to actual Chord objects."""
-        from .scales import NOTE_NAMES, ENHARMONIC
-        
-        result = []
-        key_idx = NOTE_NAMES.index(
-            self.key.upper() if self.key.upper() in NOTE_NAMES 
-            else ENHARMONIC.get(self.key.upper(), 'C')
-        )
-        
-        scale_intervals = [0, 2, 4, 5, 7, 9, 11] if self.mode == "major" else [0, 2, 3, 5, 7, 8, 10]
-        chord_qualities = MAJOR_KEY_CHORDS if self.mode == "major" else MINOR_KEY_CHORDS
-        
-        for numeral in self.chords:
-            chord = self._parse_roman_numeral(numeral, key_idx, scale_intervals, chord_qualities, octave)
-            result.append(chord)
-        
-        return result
+        return list(_resolve_progression(self.key, self.mode, self.chords, octave))
     
-    def _parse_roman_numeral(
-        self, 
-        numeral: str, 
-        key_idx: int, 
-        scale_intervals: List[int],
-        chord_qualities: Dict[int, str],
-        octave: int
-    ) -> Chord:
-        """Parse a Roman numeral chord symbol."""
-        from .scales import NOTE_NAMES
-        
-        # Handle flats/sharps
-        modifier = 0
-        if numeral.startswith('b'):
-            modifier = -1
-            numeral = numeral[1:]
-        elif numeral.startswith('#'):
-            modifier = 1
-            numeral = numeral[1:]
+    def to_midi_batch(self, octave: int = 4, pad: int = -1) -> List[List[int]]:
+        """
+        MIDI notes for every chord as one rectangular block.
         
-        # Extract base numeral
-        base_numeral = ""
-        for char in numeral:
-            if char.upper() in "IVX":
-                base_numeral += char
-            else:
-                break
+        Row i holds the notes of chord i in root position, padded with `pad`
+        to the widest chord so consumers can index [chord][voice] directly.
+        Built from the compiled numerals without creating Chord objects.
+        """
+        key_idx = NOTE_TO_IDX.get(self.key.upper(), 0)
+        octave_base = (octave + 1) * 12
         
-        remainder = numeral[len(base_numeral):]
+        rows = []
+        for offset, chord_type in _compile_progression(self.chords, self.mode):
+            root_midi = (key_idx + offset) % 12 + octave_base
+            intervals = CHORD_TYPE_RESOLVER.get(chord_type, CHORD_TYPE_RESOLVER["major"])
+            rows.append([root_midi + interval for interval in intervals])
         
-        # Get scale degree
-        degree = ROMAN_NUMERALS.get(base_numeral.upper(), 1)
-        is_minor = base_numeral.islower()
-        
-        # Calculate root note
-        interval = scale_intervals[degree - 1] + modifier
-        root_idx = (key_idx + interval) % 12
-        root = NOTE_NAMES[root_idx]
-        
-        # Determine chord quality
-        if remainder:
-            # Explicit chord type in Roman numeral
-            chord_type = remainder.replace("ø", "m7b5").lower()
-            if chord_type == "7" and is_minor:
-                chord_type = "min7"
-            elif chord_type == "7":
-                chord_type = "7"  # Dominant
-            elif chord_type == "maj7":
-                chord_type = "maj7"
-        else:
-            # Infer from numeral case
-            chord_type = "minor" if is_minor else "major"
-        
-        return Chord(root=root, chord_type=chord_type, octave=octave)
+        width = max(map(len, rows), default=0)
+        return [row + [pad] * (width - len(row)) for row in rows]
     
     def with_voice_leading(self, octave: int = 4) -> List[Chord]:
-        """Get chords with optimized voice leading."""
+        """
+        Get chords with optimized voice leading.
+        
+        The first chord keeps its written voicing; inversions for the rest
+        are chosen by dynamic programming to minimize total movement over
+        the whole progression rather than greedily chord by chord.
+        """
         raw_chords = self.to_chords(octave)
         if len(raw_chords) < 2:
             return raw_chords
         
-        result = [raw_chords[0]]
-        for chord in raw_chords[1:]:
-            voiced = voice_lead(result[-1], chord)
-            result.append(voiced)
+        # Candidate voicings per chord (the first is fixed)
+        candidates = [[raw_chords[0].get_notes()]] + [
+            inversion_notes(chord.root_midi, chord.intervals) for chord in raw_chords[1:]
+        ]
+        
+        # costs[b]: least total movement ending on candidate b of the current chord
+        # backpointers[i][b]: best candidate of chord i given candidate b of chord i + 1
+        costs = [0]
+        backpointers = []
+        for prev_voicings, voicings in zip(candidates, candidates[1:]):
+            step_costs = []
+            step_back = []
+            for notes in voicings:
+                totals = [
+                    cost + voice_leading_distance(prev_notes, notes)
+                    for cost, prev_notes in zip(costs, prev_voicings)
+                ]
+                best = totals.index(min(totals))
+                step_costs.append(totals[best])
+                step_back.append(best)
+            costs = step_costs
+            backpointers.append(step_back)
+        
+        # Walk back from the cheapest final voicing
+        inversion = costs.index(min(costs))
+        inversions = [inversion]
+        for step_back in reversed(backpointers[1:]):
+            inversion = step_back[inversion]
+            inversions.append(inversion)
+        inversions.reverse()
         
-        return result
+        return [raw_chords[0]] + [
+            Chord(root=chord.root, chord_type=chord.chord_type, octave=chord.octave, inversion=inv)
+            for chord, inv in zip(raw_chords[1:], inversions)
+        ]
 
 
+@lru_cache(maxsize=512)
 def get_progression(
     key: str,
     genre: str,
     style: str = None,
     mode: str = "major"
 ) -> Progression:
-    """Get a chord progression for a genre/style."""
+    """Get a chord progression for a genre/style. Cached; the result is immutable."""
     genre_progs = COMMON_PROGRESSIONS.get(genre.lower(), COMMON_PROGRESSIONS["pop"])
     
     if style:
@@ -217,28 +283,24 @@ def get_progression(
 # Modulation helpers
 def modulate_up_half_step(key: str) -> str:
     """Modulate up by a half step."""
-    from .scales import NOTE_NAMES
-    key_idx = NOTE_NAMES.index(key.upper() if key.upper() in NOTE_NAMES else 'C')
+    key_idx = NOTE_TO_IDX.get(key.upper(), 0)
     return NOTE_NAMES[(key_idx + 1) % 12]
 
 
 def modulate_to_relative_minor(major_key: str) -> str:
     """Get the relative minor of a major key."""
-    from .scales import NOTE_NAMES
-    key_idx = NOTE_NAMES.index(major_key.upper() if major_key.upper() in NOTE_NAMES else 'C')
+    key_idx = NOTE_TO_IDX.get(major_key.upper(), 0)
     return NOTE_NAMES[(key_idx - 3) % 12]
 
 
 def modulate_to_relative_major(minor_key: str) -> str:
     """Get the relative major of a minor key."""
-    from .scales import NOTE_NAMES
-    key_idx = NOTE_NAMES.index(minor_key.upper() if minor_key.upper() in NOTE_NAMES else 'A')
+    key_idx = NOTE_TO_IDX.get(minor_key.upper(), NOTE_TO_IDX['A'])
     return NOTE_NAMES[(key_idx + 3) % 12]
 
 
 def modulate_circle_of_fifths(key: str, steps: int = 1) -> str:
     """Move around the circle of fifths."""
-    from .scales import NOTE_NAMES
-    key_idx = NOTE_NAMES.index(key.upper() if key.upper() in NOTE_NAMES else 'C')
+    key_idx = NOTE_TO_IDX.get(key.upper(), 0)
     # Each step is 7 semitones up (fifth) or 5 semitones down (fourth)
     return NOTE_NAMES[(key_idx + (7 * steps)) % 12]
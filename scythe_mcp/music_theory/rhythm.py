@@ -6,6 +6,7 @@ Time signatures, swing, syncopation, and rhythmic patterns.
 
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
+from functools import lru_cache
 import random
 
 
@@ -23,8 +24,17 @@ TIME_SIGNATURES: Dict[str, Tuple[int, int]] = {
     "11/8": (11, 8),
 }
 
+# Shared generator for humanize/syncopation when no rng is passed.
+# Kept separate from the global random module so it can be seeded on its own.
+_RNG = random.Random()
 
-@dataclass
+
+def set_seed(seed: Optional[int] = None) -> None:
+    """Seed the shared rhythm RNG (None reseeds from system entropy)."""
+    _RNG.seed(seed)
+
+
+@dataclass(slots=True, frozen=True)
 class Note:
     """Represents a single note or hit."""
     
@@ -44,11 +54,21 @@ class Note:
         
         return self
     
-    def humanize(self, timing_range: float = 0.02, velocity_range: int = 10) -> "Note":
+    def humanize(
+        self,
+        timing_range: float = 0.02,
+        velocity_range: int = 10,
+        rng: Optional[random.Random] = None
+    ) -> "Note":
         """Add human-like variation."""
-        timing_offset = random.uniform(-timing_range, timing_range)
-        velocity_offset = random.randint(-velocity_range, velocity_range)
+        rng = rng or _RNG
+        timing_offset = rng.uniform(-timing_range, timing_range)
+        velocity_offset = rng.randint(-velocity_range, velocity_range)
         
+        return self.nudged(timing_offset, velocity_offset)
+    
+    def nudged(self, timing_offset: float, velocity_offset: int) -> "Note":
+        """Shift start and velocity, clamped to valid ranges."""
         return Note(
             start=max(0, self.start + timing_offset),
             duration=self.duration,
@@ -57,89 +77,156 @@ class Note:
         )
 
 
-@dataclass
+def note_columns(notes: List[Note]) -> Tuple[List[float], List[float], List[int], List[int]]:
+    """Split notes into parallel (start, duration, velocity, pitch) columns."""
+    return (
+        [n.start for n in notes],
+        [n.duration for n in notes],
+        [n.velocity for n in notes],
+        [n.pitch for n in notes],
+    )
+
+
+def notes_to_dicts(notes: List[Note]) -> List[Dict]:
+    """Convert notes to dicts for MCP transport in a single pass."""
+    return [
+        {"pitch": n.pitch, "start": n.start, "duration": n.duration, "velocity": n.velocity}
+        for n in notes
+    ]
+
+
+@dataclass(slots=True, frozen=True)
 class Rhythm:
-    """Represents a rhythmic pattern."""
+    """Represents a rhythmic pattern. Immutable; transforms return new rhythms."""
     
     time_signature: Tuple[int, int]
-    notes: List[Note]
+    notes: Tuple[Note, ...]
     length_beats: float = 4.0
     
+    def __post_init__(self):
+        # Accept any sequence of notes but store a tuple so the instance hashes
+        object.__setattr__(self, "notes", tuple(self.notes))
+    
     @property
     def beats_per_bar(self) -> float:
         """Get beats per bar for this time signature."""
         num, denom = self.time_signature
         return num * (4.0 / denom)
     
+    @classmethod
+    def from_columns(
+        cls,
+        time_signature: Tuple[int, int],
+        starts: List[float],
+        durations: List[float],
+        velocities: List[int],
+        pitches: List[int],
+        length_beats: float = 4.0
+    ) -> "Rhythm":
+        """Build a rhythm from parallel (start, duration, velocity, pitch) columns."""
+        return cls(
+            time_signature=time_signature,
+            notes=tuple(map(Note, starts, durations, velocities, pitches)),
+            length_beats=length_beats
+        )
+    
+    def columns(self) -> Tuple[List[float], List[float], List[int], List[int]]:
+        """Get notes as parallel (start, duration, velocity, pitch) columns."""
+        return note_columns(self.notes)
+    
     def to_dict_list(self) -> List[Dict]:
         """Convert to list of dictionaries for MCP transport."""
-        return [
-            {
-                "start": n.start,
-                "duration": n.duration,
-                "velocity": n.velocity,
-                "pitch": n.pitch
-            }
-            for n in self.notes
-        ]
+        return notes_to_dicts(self.notes)
     
     def with_swing(self, amount: float = 0.33) -> "Rhythm":
         """Apply swing to the pattern."""
+        # One pass; notes off the off-beat come back as themselves and are
+        # shared (notes are immutable)
         return Rhythm(
             time_signature=self.time_signature,
-            notes=[n.with_swing(amount) for n in self.notes],
+            notes=tuple(note.with_swing(amount) for note in self.notes),
             length_beats=self.length_beats
         )
     
-    def humanize(self) -> "Rhythm":
+    def humanize(
+        self,
+        timing_range: float = 0.02,
+        velocity_range: int = 10,
+        rng: Optional[random.Random] = None
+    ) -> "Rhythm":
         """Add human-like variation."""
+        rng = rng or _RNG
+        count = len(self.notes)
+        
+        # Draw every offset for the pattern up front
+        uniform = rng.uniform
+        timing_offsets = [uniform(-timing_range, timing_range) for _ in range(count)]
+        velocity_offsets = rng.choices(range(-velocity_range, velocity_range + 1), k=count)
+        
         return Rhythm(
             time_signature=self.time_signature,
-            notes=[n.humanize() for n in self.notes],
+            notes=[
+                n.nudged(t, v)
+                for n, t, v in zip(self.notes, timing_offsets, velocity_offsets)
+            ],
             length_beats=self.length_beats
         )
     
     def transpose(self, semitones: int) -> "Rhythm":
         """Transpose all notes by semitones."""
-        return Rhythm(
-            time_signature=self.time_signature,
-            notes=[
-                Note(n.start, n.duration, n.velocity, n.pitch + semitones)
-                for n in self.notes
-            ],
-            length_beats=self.length_beats
+        starts, durations, velocities, pitches = self.columns()
+        return Rhythm.from_columns(
+            self.time_signature,
+            starts,
+            durations,
+            velocities,
+            [p + semitones for p in pitches],
+            self.length_beats
         )
     
     def repeat(self, times: int) -> "Rhythm":
         """Repeat the pattern multiple times."""
-        new_notes = []
-        for i in range(times):
-            offset = i * self.length_beats
-            for note in self.notes:
-                new_notes.append(Note(
-                    start=note.start + offset,
-                    duration=note.duration,
-                    velocity=note.velocity,
-                    pitch=note.pitch
-                ))
-        
-        return Rhythm(
-            time_signature=self.time_signature,
-            notes=new_notes,
-            length_beats=self.length_beats * times
+        starts, durations, velocities, pitches = self.columns()
+        # Tile the columns; only the starts need a per-repeat offset
+        offset_starts = [
+            start + i * self.length_beats
+            for i in range(times)
+            for start in starts
+        ]
+        return Rhythm.from_columns(
+            self.time_signature,
+            offset_starts,
+            durations * times,
+            velocities * times,
+            pitches * times,
+            self.length_beats * times
         )
 
 
 # Basic rhythmic subdivisions (positions within one beat)
-SUBDIVISIONS = {
-    "quarter": [0.0],
-    "eighth": [0.0, 0.5],
-    "triplet": [0.0, 1/3, 2/3],
-    "sixteenth": [0.0, 0.25, 0.5, 0.75],
-    "sextuplet": [0.0, 1/6, 2/6, 3/6, 4/6, 5/6],
+SUBDIVISIONS: Dict[str, Tuple[float, ...]] = {
+    "quarter": (0.0,),
+    "eighth": (0.0, 0.5),
+    "triplet": (0.0, 1/3, 2/3),
+    "sixteenth": (0.0, 0.25, 0.5, 0.75),
+    "sextuplet": (0.0, 1/6, 2/6, 3/6, 4/6, 5/6),
 }
 
 
+@lru_cache(maxsize=128)
+def _straight_template(beats: int, subdivision: str) -> Tuple[Tuple[float, ...], float]:
+    """Grid positions and note duration for a straight pattern."""
+    divisions = SUBDIVISIONS.get(subdivision, (0.0,))
+    positions = tuple(beat + div for beat in range(beats) for div in divisions)
+    return positions, 1.0 / len(divisions) * 0.9
+
+
+# Templates for the usual bar lengths are built at import
+for _beats in range(2, 9):
+    for _subdivision in SUBDIVISIONS:
+        _straight_template(_beats, _subdivision)
+
+
 def create_straight_pattern(
     beats: int = 4,
     subdivision: str = "quarter",
@@ -148,22 +235,24 @@ def create_straight_pattern(
     accent_pattern: Optional[List[int]] = None
 ) -> Rhythm:
     """Create a straight rhythmic pattern."""
-    divisions = SUBDIVISIONS.get(subdivision, [0.0])
-    notes = []
+    positions, duration = _straight_template(beats, subdivision)
     
-    for beat in range(beats):
-        for i, div in enumerate(divisions):
-            vel = velocity
-            if accent_pattern:
-                accent_idx = (beat * len(divisions) + i) % len(accent_pattern)
-                vel = int(velocity * (1.3 if accent_pattern[accent_idx] else 0.7))
-            
-            notes.append(Note(
-                start=beat + div,
-                duration=1.0 / len(divisions) * 0.9,
-                velocity=vel,
-                pitch=pitch
-            ))
+    if accent_pattern:
+        # Accents cycle over grid steps, independent of the beat
+        accented = int(velocity * 1.3)
+        unaccented = int(velocity * 0.7)
+        cycle = len(accent_pattern)
+        velocities = [
+            accented if accent_pattern[step % cycle] else unaccented
+            for step in range(len(positions))
+        ]
+    else:
+        velocities = [velocity] * len(positions)
+    
+    notes = [
+        Note(start=start, duration=duration, velocity=vel, pitch=pitch)
+        for start, vel in zip(positions, velocities)
+    ]
     
     return Rhythm(
         time_signature=(4, 4),
@@ -176,27 +265,26 @@ def create_syncopated_pattern(
     beats: int = 4,
     density: float = 0.5,
     pitch: int = 60,
-    velocity: int = 100
+    velocity: int = 100,
+    rng: Optional[random.Random] = None
 ) -> Rhythm:
     """Create a syncopated pattern with off-beat emphasis."""
-    notes = []
+    rng = rng or _RNG
+    
+    # 16th note grid; favor off-beats based on density
+    steps = [
+        (beat + sixteenth * 0.25, 0.3, velocity) if sixteenth == 0
+        else (beat + sixteenth * 0.25, density, int(velocity * 0.8))
+        for beat in range(beats)
+        for sixteenth in range(4)
+    ]
+    draws = [rng.random() for _ in steps]
     
-    # 16th note grid
-    for beat in range(beats):
-        for sixteenth in range(4):
-            pos = beat + (sixteenth * 0.25)
-            
-            # Favor off-beats based on density
-            is_on_beat = sixteenth == 0
-            threshold = 0.3 if is_on_beat else density
-            
-            if random.random() < threshold:
-                notes.append(Note(
-                    start=pos,
-                    duration=0.2,
-                    velocity=velocity if is_on_beat else int(velocity * 0.8),
-                    pitch=pitch
-                ))
+    notes = [
+        Note(start=pos, duration=0.2, velocity=vel, pitch=pitch)
+        for (pos, threshold, vel), draw in zip(steps, draws)
+        if draw < threshold
+    ]
     
     return Rhythm(
         time_signature=(4, 4),
@@ -206,12 +294,12 @@ def create_syncopated_pattern(
 
 
 # Common rhythmic patterns
-COMMON_RHYTHMS = {
-    "four_on_floor": [0.0, 1.0, 2.0, 3.0],  # House/techno kick
-    "backbeat": [1.0, 3.0],                   # Rock/pop snare
-    "boom_bap": [0.0, 1.5, 2.75],             # Hip-hop kick
-    "reggae_one_drop": [2.5],                 # Reggae
-    "disco": [0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5],  # Disco hi-hat
+COMMON_RHYTHMS: Dict[str, Tuple[float, ...]] = {
+    "four_on_floor": (0.0, 1.0, 2.0, 3.0),  # House/techno kick
+    "backbeat": (1.0, 3.0),                   # Rock/pop snare
+    "boom_bap": (0.0, 1.5, 2.75),             # Hip-hop kick
+    "reggae_one_drop": (2.5,),                # Reggae
+    "disco": (0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5),  # Disco hi-hat
 }
 
 
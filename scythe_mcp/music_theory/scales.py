@@ -5,12 +5,14 @@ Comprehensive scale definitions including major, minor, modes,
 pentatonic, blues, and exotic scales.
 """
 
-from typing import List, Dict, Tuple
+from typing import List, Dict, Mapping, Tuple
+from types import MappingProxyType
 from dataclasses import dataclass
+from functools import lru_cache
 
 
 # Note names and their MIDI offsets from C
-NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
+NOTE_NAMES: Tuple[str, ...] = ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')
 ENHARMONIC = {
     'Db': 'C#', 'Eb': 'D#', 'Fb': 'E', 'Gb': 'F#', 
     'Ab': 'G#', 'Bb': 'A#', 'Cb': 'B',
@@ -18,16 +20,19 @@ ENHARMONIC = {
 }
 
 
+# Upper-cased note spelling (sharps and enharmonic flats) to pitch class
+NOTE_TO_IDX: Dict[str, int] = {name: idx for idx, name in enumerate(NOTE_NAMES)}
+NOTE_TO_IDX.update({
+    spelling.upper(): NOTE_TO_IDX[name] for spelling, name in ENHARMONIC.items()
+})
+
+
 def note_to_midi(note: str, octave: int = 4) -> int:
     """Convert note name to MIDI number. Middle C (C4) = 60."""
-    note_upper = note.upper()
-    if note_upper in ENHARMONIC:
-        note_upper = ENHARMONIC[note_upper]
-    
-    if note_upper not in NOTE_NAMES:
-        raise ValueError(f"Unknown note: {note}")
-    
-    return NOTE_NAMES.index(note_upper) + (octave + 1) * 12
+    try:
+        return NOTE_TO_IDX[note.upper()] + (octave + 1) * 12
+    except KeyError:
+        raise ValueError(f"Unknown note: {note}") from None
 
 
 def midi_to_note(midi: int) -> Tuple[str, int]:
@@ -38,60 +43,93 @@ def midi_to_note(midi: int) -> Tuple[str, int]:
 
 
 # Scale intervals (semitones from root)
-SCALES: Dict[str, List[int]] = {
+SCALES: Mapping[str, Tuple[int, ...]] = MappingProxyType({
     # Major and Minor
-    "major": [0, 2, 4, 5, 7, 9, 11],
-    "natural_minor": [0, 2, 3, 5, 7, 8, 10],
-    "harmonic_minor": [0, 2, 3, 5, 7, 8, 11],
-    "melodic_minor": [0, 2, 3, 5, 7, 9, 11],
+    "major": (0, 2, 4, 5, 7, 9, 11),
+    "natural_minor": (0, 2, 3, 5, 7, 8, 10),
+    "harmonic_minor": (0, 2, 3, 5, 7, 8, 11),
+    "melodic_minor": (0, 2, 3, 5, 7, 9, 11),
     
     # Modes
-    "ionian": [0, 2, 4, 5, 7, 9, 11],      # Same as major
-    "dorian": [0, 2, 3, 5, 7, 9, 10],
-    "phrygian": [0, 1, 3, 5, 7, 8, 10],
-    "lydian": [0, 2, 4, 6, 7, 9, 11],
-    "mixolydian": [0, 2, 4, 5, 7, 9, 10],
-    "aeolian": [0, 2, 3, 5, 7, 8, 10],     # Same as natural minor
-    "locrian": [0, 1, 3, 5, 6, 8, 10],
+    "ionian": (0, 2, 4, 5, 7, 9, 11),      # Same as major
+    "dorian": (0, 2, 3, 5, 7, 9, 10),
+    "phrygian": (0, 1, 3, 5, 7, 8, 10),
+    "lydian": (0, 2, 4, 6, 7, 9, 11),
+    "mixolydian": (0, 2, 4, 5, 7, 9, 10),
+    "aeolian": (0, 2, 3, 5, 7, 8, 10),     # Same as natural minor
+    "locrian": (0, 1, 3, 5, 6, 8, 10),
     
     # Pentatonic
-    "major_pentatonic": [0, 2, 4, 7, 9],
-    "minor_pentatonic": [0, 3, 5, 7, 10],
+    "major_pentatonic": (0, 2, 4, 7, 9),
+    "minor_pentatonic": (0, 3, 5, 7, 10),
     
     # Blues
-    "blues": [0, 3, 5, 6, 7, 10],
-    "blues_major": [0, 2, 3, 4, 7, 9],
+    "blues": (0, 3, 5, 6, 7, 10),
+    "blues_major": (0, 2, 3, 4, 7, 9),
     
     # Jazz/Bebop
-    "bebop_dominant": [0, 2, 4, 5, 7, 9, 10, 11],
-    "bebop_major": [0, 2, 4, 5, 7, 8, 9, 11],
+    "bebop_dominant": (0, 2, 4, 5, 7, 9, 10, 11),
+    "bebop_major": (0, 2, 4, 5, 7, 8, 9, 11),
     
     # Exotic
-    "whole_tone": [0, 2, 4, 6, 8, 10],
-    "diminished": [0, 2, 3, 5, 6, 8, 9, 11],      # Half-whole
-    "diminished_hw": [0, 1, 3, 4, 6, 7, 9, 10],   # Whole-half
-    "hungarian_minor": [0, 2, 3, 6, 7, 8, 11],
-    "spanish": [0, 1, 4, 5, 7, 8, 10],
-    "japanese": [0, 1, 5, 7, 8],
-    "arabic": [0, 1, 4, 5, 7, 8, 11],
+    "whole_tone": (0, 2, 4, 6, 8, 10),
+    "diminished": (0, 2, 3, 5, 6, 8, 9, 11),      # Half-whole
+    "diminished_hw": (0, 1, 3, 4, 6, 7, 9, 10),   # Whole-half
+    "hungarian_minor": (0, 2, 3, 6, 7, 8, 11),
+    "spanish": (0, 1, 4, 5, 7, 8, 10),
+    "japanese": (0, 1, 5, 7, 8),
+    "arabic": (0, 1, 4, 5, 7, 8, 11),
     
     # Chiptune/Game
-    "chromatic": [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11],
-}
-
-
-@dataclass
+    "chromatic": (0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11),
+})
+
+
+@lru_cache(maxsize=256)
+def _scale_note_names(root_idx: int, intervals: Tuple[int, ...]) -> Tuple[str, ...]:
+    """Note names for a root pitch class and interval set."""
+    return tuple(NOTE_NAMES[(root_idx + interval) % 12] for interval in intervals)
+
+
+@lru_cache(maxsize=256)
+def _pitch_class_mask(root_class: int, intervals: Tuple[int, ...]) -> int:
+    """12-bit mask with bit n set when pitch class n is in the scale."""
+    mask = 0
+    for interval in intervals:
+        mask |= 1 << ((root_class + interval) % 12)
+    return mask
+
+
+@lru_cache(maxsize=256)
+def _snap_offsets(root_class: int, intervals: Tuple[int, ...]) -> Tuple[int, ...]:
+    """
+    Offset to the nearest in-scale note for each of the 12 pitch classes.
+    Searches up before down at each distance, matching nearest_in_scale.
+    """
+    mask = _pitch_class_mask(root_class, intervals)
+    offsets = []
+    for note_class in range(12):
+        offset = 0
+        for candidate in (0, 1, -1, 2, -2, 3, -3, 4, -4, 5, -5, 6, -6):
+            if mask >> ((note_class + candidate) % 12) & 1:
+                offset = candidate
+                break
+        offsets.append(offset)
+    return tuple(offsets)
+
+
+@dataclass(slots=True, frozen=True)
 class Scale:
-    """Represents a musical scale."""
+    """Represents a musical scale. Immutable, so instances can be cached and shared."""
     
     root: str
     scale_type: str
     octave: int = 4
     
     @property
-    def intervals(self) -> List[int]:
+    def intervals(self) -> Tuple[int, ...]:
         """Get the intervals for this scale type."""
-        return SCALES.get(self.scale_type, SCALES["major"])
+        return SCALE_RESOLVER.get(self.scale_type, SCALES["major"])
     
     @property
     def root_midi(self) -> int:
@@ -100,22 +138,17 @@ class Scale:
     
     def get_notes(self, octaves: int = 1) -> List[int]:
         """Get MIDI note numbers for the scale across given octaves."""
-        notes = []
-        for oct in range(octaves):
-            base = self.root_midi + (oct * 12)
-            for interval in self.intervals:
-                notes.append(base + interval)
-        return notes
+        root_midi = self.root_midi
+        intervals = self.intervals
+        return [
+            root_midi + (oct * 12) + interval
+            for oct in range(octaves)
+            for interval in intervals
+        ]
     
     def get_note_names(self) -> List[str]:
         """Get note names for this scale."""
-        root_idx = NOTE_NAMES.index(self.root.upper() if self.root.upper() in NOTE_NAMES 
-                                     else ENHARMONIC.get(self.root.upper(), 'C'))
-        names = []
-        for interval in self.intervals:
-            idx = (root_idx + interval) % 12
-            names.append(NOTE_NAMES[idx])
-        return names
+        return list(_scale_note_names(NOTE_TO_IDX.get(self.root.upper(), 0), self.intervals))
     
     def degree_to_midi(self, degree: int, octave_offset: int = 0) -> int:
         """
@@ -135,43 +168,47 @@ class Scale:
         interval = self.intervals[degree_in_scale]
         return self.root_midi + interval + ((octave_offset + octave_add) * 12)
     
+    def degrees_to_midi(self, degrees: List[int], octave_offset: int = 0) -> List[int]:
+        """
+        Convert a sequence of scale degrees to MIDI notes.
+        Same rules as degree_to_midi, resolving root and intervals once.
+        """
+        intervals = self.intervals
+        num_notes = len(intervals)
+        base = self.root_midi + (octave_offset * 12)
+        
+        notes = []
+        for degree in degrees:
+            degree_idx = degree - 1 if degree > 0 else degree
+            octave_add, degree_in_scale = divmod(degree_idx, num_notes)
+            notes.append(base + intervals[degree_in_scale] + (octave_add * 12))
+        return notes
+    
     def contains(self, midi_note: int) -> bool:
         """Check if a MIDI note is in this scale."""
-        note_class = midi_note % 12
-        root_class = self.root_midi % 12
-        
-        for interval in self.intervals:
-            if (root_class + interval) % 12 == note_class:
-                return True
-        return False
+        mask = _pitch_class_mask(self.root_midi % 12, self.intervals)
+        return bool(mask >> (midi_note % 12) & 1)
     
     def nearest_in_scale(self, midi_note: int) -> int:
         """Find the nearest note that's in this scale."""
-        if self.contains(midi_note):
-            return midi_note
-        
-        # Check notes above and below
-        for offset in range(1, 7):
-            if self.contains(midi_note + offset):
-                return midi_note + offset
-            if self.contains(midi_note - offset):
-                return midi_note - offset
-        
-        return midi_note
+        return midi_note + _snap_offsets(self.root_midi % 12, self.intervals)[midi_note % 12]
+    
+    def nearest_in_scale_many(self, midi_notes: List[int]) -> List[int]:
+        """Snap a sequence of MIDI notes to this scale."""
+        offsets = _snap_offsets(self.root_midi % 12, self.intervals)
+        return [note + offsets[note % 12] for note in midi_notes]
 
 
 def get_relative_minor(major_root: str) -> str:
     """Get the relative minor of a major key."""
-    root_idx = NOTE_NAMES.index(major_root.upper() if major_root.upper() in NOTE_NAMES 
-                                 else ENHARMONIC.get(major_root.upper(), 'C'))
+    root_idx = NOTE_TO_IDX.get(major_root.upper(), 0)
     minor_idx = (root_idx - 3) % 12
     return NOTE_NAMES[minor_idx]
 
 
 def get_relative_major(minor_root: str) -> str:
     """Get the relative major of a minor key."""
-    root_idx = NOTE_NAMES.index(minor_root.upper() if minor_root.upper() in NOTE_NAMES 
-                                 else ENHARMONIC.get(minor_root.upper(), 'C'))
+    root_idx = NOTE_TO_IDX.get(minor_root.upper(), 0)
     major_idx = (root_idx + 3) % 12
     return NOTE_NAMES[major_idx]
 
@@ -189,6 +226,12 @@ SCALE_ALIASES = {
     "maj_penta": "major_pentatonic",
 }
 
+# Scale type or alias straight to its intervals, so Scale.intervals is one lookup
+SCALE_RESOLVER: Dict[str, Tuple[int, ...]] = {
+    **{alias: SCALES[name] for alias, name in SCALE_ALIASES.items()},
+    **SCALES,
+}
+
 
 def get_scale(root: str, scale_type: str, octave: int = 4) -> Scale:
     """Factory function to create a Scale with alias support."""
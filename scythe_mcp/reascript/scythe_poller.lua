@@ -67,14 +67,14 @@ local function parse_json(str)
     end
     
     -- Extract other simple params
-    for key, val in str:gmatch('"(%w+)"%s*:%s*([%d%.]+)') do
+    for key, val in str:gmatch('"([%w_]+)"%s*:%s*([%d%.]+)') do
         if key ~= "timestamp" then
             result.params[key] = tonumber(val)
         end
     end
     
     -- Extract string params (not code)
-    for key, val in str:gmatch('"(%w+)"%s*:%s*"([^"]*)"') do
+    for key, val in str:gmatch('"([%w_]+)"%s*:%s*"([^"]*)"') do
         if key ~= "command" and key ~= "code" and not result.params[key] then
             result.params[key] = val
         end
@@ -83,21 +83,33 @@ local function parse_json(str)
     return result
 end
 
-local function write_response(data)
-    local f = io.open(RESPONSE_FILE, "w")
+-- JSON escapes for the characters that can't appear raw in a string
+local JSON_ESCAPES = {
+    ['"'] = '\\"', ['\\'] = '\\\\', ['\n'] = '\\n', ['\r'] = '\\r', ['\t'] = '\\t',
+}
+
+local function json_string(value)
+    -- Lua errors quote the chunk name ([string "..."]), so always escape
+    local escaped = tostring(value):gsub('[%c"\\]', function(c)
+        return JSON_ESCAPES[c] or string.format("\\u%04x", c:byte())
+    end)
+    return '"' .. escaped .. '"'
+end
+
+local function write_response(data, path)
+    -- Commands may name their own response file (one per call)
+    local f = io.open(path or RESPONSE_FILE, "w")
     if f then
         -- Simple JSON encoding
         f:write('{"success": ' .. tostring(data.success))
         if data.message then
-            f:write(', "message": "' .. data.message .. '"')
+            f:write(', "message": ' .. json_string(data.message))
         end
         if data.error then
-            f:write(', "error": "' .. data.error .. '"')
+            f:write(', "error": ' .. json_string(data.error))
         end
         if data.result then
-            -- Sanitize result for JSON string
-            local res_str = tostring(data.result):gsub('"', '\\"'):gsub('\n', '\\n')
-            f:write(', "result": "' .. res_str .. '"')
+            f:write(', "result": ' .. json_string(data.result))
         end
         f:write('}')
         f:close()
@@ -251,12 +263,22 @@ local function process_commands()
             
             local handler = handlers[cmd.command]
             if handler then
+                -- Tell the caller the command is running, so it waits for long scripts
+                local started_path = cmd.params and cmd.params.started_path
+                if started_path then
+                    local sf = io.open(started_path, "w")
+                    if sf then sf:close() end
+                end
+                
                 -- reaper.Undo_BeginBlock()
                 local result = handler(cmd.params or {})
                 -- reaper.Undo_EndBlock("Scythe: " .. cmd.command, -1)
-                write_response(result)
+                write_response(result, cmd.params and cmd.params.response_path)
             else
-                write_response({success = false, error = "Unknown command: " .. cmd.command})
+                write_response(
+                    {success = false, error = "Unknown command: " .. cmd.command},
+                    cmd.params and cmd.params.response_path
+                )
             end
         end
     end
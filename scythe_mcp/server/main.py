@@ -6,17 +6,40 @@ Uses OSC for transport/mixer and file-based commands for complex operations.
 """
 
 from mcp.server.fastmcp import FastMCP, Context
+import asyncio
+import json
 import logging
-from typing import Dict, Any, List
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
+from pydantic import BaseModel
 
 from .reaper_bridge import get_bridge, ReaperBridge
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+if TYPE_CHECKING:
+    from ..music_theory.chords import Chord
+
+# Library-safe logger: the host application decides where records go.
+# Handlers are only installed by main() when running as the server.
 logger = logging.getLogger("ScytheMCP")
+logger.addHandler(logging.NullHandler())
+
+
+def _clamp(value: float, lo: float, hi: float) -> float:
+    """Limit value to [lo, hi] with comparisons only (NaN maps to hi, as min/max did)."""
+    return lo if value < lo else value if value <= hi else hi
+
+
+def _configure_logging(level: int = logging.INFO):
+    """Configure root logging for the standalone server process."""
+    logging.basicConfig(
+        level=level,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
 
 
 # Create the MCP server
@@ -30,24 +53,35 @@ mcp = FastMCP(
 # SESSION TOOLS
 # =============================================================================
 
-@mcp.tool()
-def get_session_info(ctx: Context) -> str:
-    """
-    Get information about REAPER. Note: OSC is primarily for sending commands.
-    Use this to confirm connection is working.
-    """
-    bridge = get_bridge()
+# Connection summary, kept once OSC is ready; errors are rebuilt on every call
+_session_info_text: Optional[str] = None
+
+
+def _session_info() -> str:
+    """Connection summary; a ready one is built once, since the OSC setup then never changes."""
+    global _session_info_text
+    if _session_info_text is not None:
+        return _session_info_text
     
-    # Test OSC by sending a harmless command
+    bridge = get_bridge()
     if bridge._osc_client:
-        return """REAPER Connection:
-- OSC: Ready (localhost:8000)
+        _session_info_text = f"""REAPER Connection:
+- OSC: Ready ({bridge.osc_host}:{bridge.osc_port})
 - Commands: File-based polling active
 
 To verify: Check that OSC is enabled in REAPER:
 Preferences → Control/OSC/Web → Add → OSC"""
-    else:
-        return "Error: OSC client not initialized. Install python-osc: uv add python-osc"
+        return _session_info_text
+    return "Error: OSC client not initialized. Install python-osc: uv add python-osc"
+
+
+@mcp.tool()
+def get_session_info(ctx: Context) -> str:
+    """
+    Get information about REAPER. Note: OSC is primarily for sending commands.
+    Use this to confirm connection is working.
+    """
+    return _session_info()
 
 
 @mcp.tool()
@@ -117,7 +151,7 @@ def goto_position(ctx: Context, seconds: float) -> str:
 # =============================================================================
 
 @mcp.tool()
-def create_track(ctx: Context, name: str = "New Track") -> str:
+async def create_track(ctx: Context, name: str = "New Track") -> str:
     """
     Create a new track.
     
@@ -125,8 +159,8 @@ def create_track(ctx: Context, name: str = "New Track") -> str:
         name: Name for the new track
     """
     bridge = get_bridge()
-    result = bridge.create_track(name)
-    return result.get("message", "Track created")
+    result = await asyncio.to_thread(bridge.create_track, name)
+    return result.message
 
 
 @mcp.tool()
@@ -140,7 +174,7 @@ def set_track_volume(ctx: Context, track_number: int, volume: float) -> str:
     """
     bridge = get_bridge()
     # Convert to 0-indexed internally
-    if bridge.set_track_volume(track_number - 1, max(0.0, min(1.0, volume))):
+    if bridge.set_track_volume(track_number - 1, _clamp(volume, 0.0, 1.0)):
         return f"Track {track_number} volume set to {volume}"
     return "Error: OSC command failed"
 
@@ -155,7 +189,7 @@ def set_track_pan(ctx: Context, track_number: int, pan: float) -> str:
         pan: Pan position (-1.0 = full left, 0.0 = center, 1.0 = full right)
     """
     bridge = get_bridge()
-    if bridge.set_track_pan(track_number - 1, max(-1.0, min(1.0, pan))):
+    if bridge.set_track_pan(track_number - 1, _clamp(pan, -1.0, 1.0)):
         return f"Track {track_number} pan set to {pan}"
     return "Error: OSC command failed"
 
@@ -227,7 +261,7 @@ def select_track(ctx: Context, track_number: int) -> str:
 # =============================================================================
 
 @mcp.tool()
-def create_midi_item(
+async def create_midi_item(
     ctx: Context,
     track_number: int,
     position: float = 0.0,
@@ -242,16 +276,25 @@ def create_midi_item(
         length: Length in beats (default: 4 = 1 bar in 4/4)
     """
     bridge = get_bridge()
-    result = bridge.insert_midi_item(track_number - 1, position, length)
+    result = await asyncio.to_thread(bridge.insert_midi_item, track_number - 1, position, length)
     return result.get("message", "MIDI item created")
 
 
+class NoteSpec(BaseModel):
+    """One MIDI note as accepted by add_notes; positions are in beats."""
+    
+    pitch: int = 60
+    start: float = 0.0
+    duration: float = 1.0
+    velocity: int = 100
+
+
 @mcp.tool()
-def add_notes(
+async def add_notes(
     ctx: Context,
     track_number: int,
     item_index: int,
-    notes: List[Dict[str, Any]]
+    notes: List[NoteSpec]
 ) -> str:
     """
     Add MIDI notes to an existing MIDI item.
@@ -266,12 +309,53 @@ def add_notes(
             - velocity: Velocity (1-127, default 100)
     """
     bridge = get_bridge()
-    result = bridge.add_notes(track_number - 1, item_index, notes)
+    # Notes arrive validated and typed, so they go straight to columns
+    result = await asyncio.to_thread(
+        bridge.add_notes_columns,
+        track_number - 1,
+        item_index,
+        [n.pitch for n in notes],
+        [n.start for n in notes],
+        [n.duration for n in notes],
+        [n.velocity for n in notes],
+    )
     return result.get("message", f"Added {len(notes)} note(s)")
 
 
 @mcp.tool()
-def execute_lua(ctx: Context, code: str) -> str:
+async def add_notes_bulk(
+    ctx: Context,
+    track_number: int,
+    item_index: int,
+    pitches: List[int],
+    starts: List[float],
+    durations: List[float],
+    velocities: List[int]
+) -> str:
+    """
+    Add MIDI notes to an existing MIDI item as parallel arrays.
+    
+    Cheaper than add_notes for large generated patterns. Note i is
+    (pitches[i], starts[i], durations[i], velocities[i]); all four lists
+    must have the same length.
+    
+    Args:
+        track_number: Track number (1-based)
+        item_index: Index of the MIDI item (0-based)
+        pitches: MIDI note numbers (0-127, middle C = 60)
+        starts: Start positions in beats (relative to item)
+        durations: Durations in beats
+        velocities: Velocities (1-127)
+    """
+    bridge = get_bridge()
+    result = await asyncio.to_thread(
+        bridge.add_notes_columns, track_number - 1, item_index, pitches, starts, durations, velocities
+    )
+    return result.get("message", f"Added {len(pitches)} note(s)")
+
+
+@mcp.tool()
+async def execute_lua(ctx: Context, code: str, timeout: float = 5.0) -> str:
     """
     Execute arbitrary Lua code in REAPER.
     
@@ -280,12 +364,13 @@ def execute_lua(ctx: Context, code: str) -> str:
     
     Args:
         code: Lua code to execute
+        timeout: Seconds REAPER has to start and answer (running scripts get longer)
     
     Example:
         execute_lua("reaper.ShowMessageBox('Hello from MCP!', 'Test', 0)")
     """
     bridge = get_bridge()
-    result = bridge.execute_lua(code)
+    result = await asyncio.to_thread(bridge.execute_lua, code, timeout)
     return result.get("message", "Lua code executed")
 
 
@@ -318,18 +403,28 @@ def trigger_action(ctx: Context, action_name: str) -> str:
 # GENERATOR TOOLS
 # =============================================================================
 
-from ..generators.drums import generate_drum_pattern
-from ..generators.basslines import generate_bassline
-from ..generators.melodies import generate_melody
-from ..music_theory.chords import parse_chord
-from ..music_theory.scales import Scale
+# Generator and music theory modules are imported inside the tools that use
+# them, so starting the server (or only driving transport) doesn't load them.
+
+def _dumps_notes(notes: List[Dict]) -> str:
+    """Compact JSON for a note list; uses orjson when it is installed."""
+    if HAS_ORJSON:
+        return orjson.dumps(notes).decode()
+    return json.dumps(notes, separators=(",", ":"))
+
+
+def _parse_chords(progression: List[str]) -> List["Chord"]:
+    """Chord objects for a list of chord names."""
+    from ..music_theory.chords import parse_chord
+    return [parse_chord(name) for name in progression]
 
 @mcp.tool()
-def add_drum_track(
+async def add_drum_track(
     ctx: Context,
     genre: str = "electronic",
     bars: int = 4,
-    variation: str = "basic"
+    variation: str = "basic",
+    seed: Optional[int] = None
 ) -> str:
     """
     Generate and add a drum track.
@@ -338,33 +433,26 @@ def add_drum_track(
         genre: Genre (electronic, hiphop, rock, trap, lofi)
         bars: Number of bars
         variation: Pattern variation
+        seed: Optional random seed; the same seed reproduces (and reuses) the same notes
     """
+    from ..generators.drums import generate_drum_pattern
+    
     bridge = get_bridge()
     
-    # Create track
+    # Generate patterns
+    pattern = generate_drum_pattern(genre=genre, bars=bars, variation=variation, seed=seed)
+    columns = pattern.to_soa()
+    
+    # Create track, MIDI item and notes in one round-trip
     track_name = f"{genre.capitalize()} Drums"
-    res = bridge.create_track(track_name)
-    # Give it a moment to exist in REAPER logic (approx)
-    import time
-    time.sleep(0.3)
+    res = await asyncio.to_thread(bridge.create_track_with_midi, track_name, 0, bars * 4, *columns)  # Assuming 4/4
     
-    if not res.get("success") or "track_index" not in res:
-         return f"Error: Failed to create track. {res.get('message')}"
+    if not res.success:
+         return f"Error: Failed to create track. {res.message}"
     
-    track_index = res["track_index"]
-
-    # Generate patterns
-    pattern = generate_drum_pattern(genre=genre, bars=bars, variation=variation)
-    notes = pattern.to_midi_notes()
-
-    # Insert MIDI item
-    bridge.insert_midi_item(track_index, position=0, length=bars * 4) # Assuming 4/4
-    
-    # Add Notes
-    # bridge.add_notes now handles logic internally via execute_lua
-    bridge.add_notes(track_index, 0, notes) # item_index 0 (newest/first)
+    track_index = res.track_index
     
-    return f"Created drum track '{track_name}' ID:{track_index+1} with {len(notes)} notes."
+    return f"Created drum track '{track_name}' ID:{track_index+1} with {len(columns[0])} notes."
 
 # Forgetting complexities, let's just expose the RAW generators which return JSON,
 # and let the user (or LLM) use `create_midi_item` + `add_notes` manually?
@@ -372,11 +460,12 @@ def add_drum_track(
 # Let's implement robust Logic in the tool.
 
 @mcp.tool()
-def add_bass_track(
+async def add_bass_track(
     ctx: Context,
     progression: List[str],
     style: str = "root_fifth",
-    bars_per_chord: int = 4
+    bars_per_chord: int = 4,
+    seed: Optional[int] = None
 ) -> str:
     """
     Generate and add a bass track provided a chord progression.
@@ -384,33 +473,40 @@ def add_bass_track(
     Args:
         progression: List of chords ["Cm7", "Fm7"]
         style: Bass style (root, root_fifth, walking, synth, 808)
+        seed: Optional random seed; the same seed reproduces (and reuses) the same notes
     """
+    return await _add_bass_track(_parse_chords(progression), style, bars_per_chord, seed)
+
+async def _add_bass_track(
+    chords: List["Chord"],
+    style: str,
+    bars_per_chord: int,
+    seed: Optional[int]
+) -> str:
+    """add_bass_track for already parsed chords."""
+    from ..generators.basslines import generate_bassline
+    
     bridge = get_bridge()
-    track_name = f"Bass ({style})"
-    res = bridge.create_track(track_name)
-    import time
-    time.sleep(0.3)
     
-    if not res.get("success") or "track_index" not in res:
-         return f"Error: Failed to create track. {res.get('message')}"
-    track_index = res["track_index"]
+    bass = generate_bassline(chords, style=style, beats_per_chord=float(bars_per_chord), seed=seed)
+    columns = bass.to_soa()
     
-    chords = [parse_chord(name) for name in progression]
-    bass = generate_bassline(chords, style=style, beats_per_chord=float(bars_per_chord))
-    notes = bass.to_dict_list()
+    track_name = f"Bass ({style})"
+    res = await asyncio.to_thread(bridge.create_track_with_midi, track_name, 0, len(chords) * bars_per_chord, *columns)
     
-    bridge.insert_midi_item(track_index, 0, len(chords) * bars_per_chord)
-    bridge.add_notes(track_index, 0, notes)
+    if not res.success:
+         return f"Error: Failed to create track. {res.message}"
     
-    return f"Created bass track with {len(notes)} notes."
+    return f"Created bass track with {len(columns[0])} notes."
 
 @mcp.tool()
-def add_melody_track(
+async def add_melody_track(
     ctx: Context,
     key: str = "C",
     scale_type: str = "minor",
     style: str = "varied",
-    bars: int = 4
+    bars: int = 4,
+    seed: Optional[int] = None
 ) -> str:
     """
     Generate and add a melody track.
@@ -419,34 +515,34 @@ def add_melody_track(
         key: Key (C, D#, etc)
         scale_type: major, minor, dorian, etc.
         style: varied, straight, syncopated
+        seed: Optional random seed; the same seed reproduces (and reuses) the same notes
     """
-    bridge = get_bridge()
-    track_name = f"Melody ({key} {scale_type})"
-    res = bridge.create_track(track_name)
-    import time
-    time.sleep(0.3)
+    from ..generators.melodies import generate_melody
+    from ..music_theory.scales import Scale
     
-    if not res.get("success") or "track_index" not in res:
-         return f"Error: Failed to create track. {res.get('message')}"
-    track_index = res["track_index"]
+    bridge = get_bridge()
     
     scale = Scale(key, scale_type)
-    melody = generate_melody(scale=scale, style=style, bars=bars)
-    notes = melody.to_dict_list()
+    melody = generate_melody(scale=scale, style=style, bars=bars, seed=seed)
+    columns = melody.to_soa()
+    
+    track_name = f"Melody ({key} {scale_type})"
+    res = await asyncio.to_thread(bridge.create_track_with_midi, track_name, 0, bars * 4, *columns)
     
-    bridge.insert_midi_item(track_index, 0, bars * 4)
-    bridge.add_notes(track_index, 0, notes)
+    if not res.success:
+         return f"Error: Failed to create track. {res.message}"
     
-    return f"Created melody track with {len(notes)} notes."
+    return f"Created melody track with {len(columns[0])} notes."
 
 @mcp.tool()
-def create_song_sketch(
+async def create_song_sketch(
     ctx: Context,
     genre: str = "electronic",
     key: str = "C",
     scale_type: str = "minor",
     bars: int = 4,
-    tempo: int = 120
+    tempo: int = 120,
+    seed: Optional[int] = None
 ) -> str:
     """
     Generate a full song sketch (Drums, Bass, Harmony, Melody).
@@ -457,57 +553,93 @@ def create_song_sketch(
         scale_type: Scale type (major, minor)
         bars: Length in bars
         tempo: Project tempo
+        seed: Optional random seed; the same seed reproduces (and reuses) the same notes
     """
+    from ..music_theory.progressions import get_progression
+    
     bridge = get_bridge()
+    
+    # Tempo is the sketch's only OSC; it is sent before the first track's Lua script
     bridge.set_tempo(tempo)
     
     # 1. Progression
-    from ..music_theory.progressions import get_progression
     # Map scale_type to mode (major/minor)
     mode = "minor" if "minor" in scale_type else "major"
     prog_obj = get_progression(key=key, genre=genre, mode=mode)
     prog_chords = prog_obj.to_chords()
-    prog_names = [f"{c.root}{c.chord_type}" for c in prog_chords] # Construct chord names manually or use str(c) if available
-    
-    results = []
     
-    # 2. Drums
-    results.append(add_drum_track(ctx, genre=genre, bars=bars))
-    
-    # 3. Bass
     # Map genre to bass style
     bass_style = "root_fifth"
     if genre in ["trap", "hiphop"]: bass_style = "808"
     elif genre == "electronic": bass_style = "synth"
     
-    results.append(add_bass_track(ctx, progression=prog_names, style=bass_style, bars_per_chord=1)) # Prog usually 1 chord/bar?
-    # generate_progression returns list of Chords. Length=bars implies 1 chord per bar.
-    
-    # 4. Melody
-    results.append(add_melody_track(ctx, key=key, scale_type=scale_type, style="syncopated", bars=bars))
+    # 2-4. Drums, bass and melody, awaited in turn so the tracks keep that
+    # order in REAPER (the bridge runs round-trips one at a time anyway)
+    results = [
+        await add_drum_track(ctx, genre=genre, bars=bars, seed=seed),
+        # generate_progression returns list of Chords. Length=bars implies 1 chord per bar.
+        await _add_bass_track(prog_chords, style=bass_style, bars_per_chord=1, seed=seed),
+        await add_melody_track(ctx, key=key, scale_type=scale_type, style="syncopated", bars=bars, seed=seed),
+    ]
     
     return "Song Sketch Created:\n- " + "\n- ".join(results)
 
+def generate_drums_notes(
+    genre: str = "electronic",
+    bars: int = 4,
+    seed: Optional[int] = None
+) -> List[Dict]:
+    """Drum pattern notes as dicts, as serialized by generate_drums_json."""
+    from ..generators.drums import generate_drum_pattern
+    
+    return generate_drum_pattern(genre=genre, bars=bars, seed=seed).to_midi_notes()
+
+def generate_bass_notes(
+    progression: List[str],
+    style: str = "root_fifth",
+    bars_per_chord: int = 4,
+    seed: Optional[int] = None
+) -> List[Dict]:
+    """Bassline notes as dicts, as serialized by generate_bass_json."""
+    from ..generators.basslines import generate_bassline
+    
+    chords = _parse_chords(progression)
+    bass = generate_bassline(chords, style=style, beats_per_chord=float(bars_per_chord), seed=seed)
+    return bass.to_dict_list()
+
+def generate_melody_notes(
+    key: str = "C",
+    scale_type: str = "minor",
+    style: str = "varied",
+    seed: Optional[int] = None
+) -> List[Dict]:
+    """Melody notes as dicts, as serialized by generate_melody_json."""
+    from ..generators.melodies import generate_melody
+    from ..music_theory.scales import Scale
+    
+    scale = Scale(key, scale_type)
+    return generate_melody(scale=scale, style=style, seed=seed).to_dict_list()
+
 @mcp.tool()
 def generate_drums_json(
     ctx: Context,
     genre: str = "electronic",
-    bars: int = 4
+    bars: int = 4,
+    seed: Optional[int] = None
 ) -> str:
     """
     Generate drum pattern data (JSON) to be used with add_notes.
-    Returns the note list directly.
+    Returns the note list directly; pass a seed for reproducible notes.
     """
-    pattern = generate_drum_pattern(genre=genre, bars=bars)
-    import json
-    return json.dumps(pattern.to_midi_notes())
+    return _dumps_notes(generate_drums_notes(genre, bars, seed))
 
 @mcp.tool()
 def generate_bass_json(
     ctx: Context,
     progression: List[str],
     style: str = "root_fifth",
-    bars_per_chord: int = 4
+    bars_per_chord: int = 4,
+    seed: Optional[int] = None
 ) -> str:
     """
     Generate bassline data (JSON) from chord progression.
@@ -515,31 +647,28 @@ def generate_bass_json(
     Args:
         progression: List of chord names ["Cmaj7", "Am7"]
         style: Bass style
+        seed: Optional random seed; the same seed reproduces (and reuses) the same notes
     """
-    chords = [parse_chord(name) for name in progression]
-    bass = generate_bassline(chords, style=style, beats_per_chord=float(bars_per_chord))
-    import json
-    return json.dumps(bass.to_dict_list())
+    return _dumps_notes(generate_bass_notes(progression, style, bars_per_chord, seed))
 
 @mcp.tool()
 def generate_melody_json(
     ctx: Context,
     key: str = "C",
     scale_type: str = "minor",
-    style: str = "varied"
+    style: str = "varied",
+    seed: Optional[int] = None
 ) -> str:
     """
-    Generate melody data (JSON).
+    Generate melody data (JSON). Pass a seed for reproducible notes.
     """
-    scale = Scale(key, scale_type)
-    melody = generate_melody(scale=scale, style=style)
-    import json
-    return json.dumps(melody.to_dict_list())
+    return _dumps_notes(generate_melody_notes(key, scale_type, style, seed))
     
 # ENTRY POINT
 
 def main():
     """Run the MCP server."""
+    _configure_logging()
     logger.info("Starting Scythe MCP Server (OSC mode)...")
     mcp.run()
 
@@ -6,25 +6,70 @@ Uses OSC for transport/basic commands and file-based polling for complex operati
 
 import os
 import json
+import socket
+import struct
 import time
 import logging
 import tempfile
+import threading
+import uuid
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Mapping, NamedTuple, Tuple
+from contextlib import contextmanager
 from dataclasses import dataclass, field
+from enum import IntEnum
+from functools import lru_cache
 
 try:
     from pythonosc import udp_client
     from pythonosc.osc_message_builder import OscMessageBuilder
+    from pythonosc.osc_bundle_builder import OscBundleBuilder, IMMEDIATELY
     HAS_OSC = True
 except ImportError:
     HAS_OSC = False
 
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+    HAS_INOTIFY = True
+except ImportError:
+    # Not available (or not Linux): responses are polled with backoff
+    HAS_INOTIFY = False
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 logger = logging.getLogger("ScytheMCP")
 
+# Backoff between checks for a response file from the Lua poller (seconds):
+# starts short so fast replies are seen at once, doubles up to the cap
+RESPONSE_POLL_MIN = 0.0005
+RESPONSE_POLL_MAX = 0.02
+
+# A response that doesn't parse is read again after this long; if its size is
+# unchanged it was complete and is reported as unreadable (seconds)
+RESPONSE_SETTLE_DELAY = 0.05
+
+# Once the poller has started a command, how much longer to wait for it to finish (seconds)
+COMMAND_RUN_TIMEOUT = 60.0
+
+# Kernel send buffer requested for the OSC socket (bytes)
+OSC_SEND_BUFFER = 1 << 20
+
+# Track values closer than this to the last one sent are not re-sent
+TRACK_VALUE_TOLERANCE = 1e-6
+
+# One note in a binary notes file: pitch, start, duration (beats), velocity.
+# Little-endian with explicit sizes so Lua's string.unpack reads the same layout.
+NOTE_RECORD = struct.Struct("<hddh")
+NOTE_RECORD_LUA = "<i2ddi2"
+
 
 # REAPER Action IDs (from REAPER Action List)
-REAPER_ACTIONS = {
+REAPER_ACTIONS: Mapping[str, int] = MappingProxyType({
     # Transport
     "play": 1007,
     "stop": 1016,
@@ -56,7 +101,140 @@ REAPER_ACTIONS = {
     "new_project": 40023,
     "undo": 40029,
     "redo": 40030,
-}
+})
+
+# The same actions as an enum, so callers can skip the name lookup:
+# trigger_action(Action.PLAY)
+Action = IntEnum("Action", {name.upper(): action_id for name, action_id in REAPER_ACTIONS.items()})
+
+# Action ID straight to its OSC address, built once
+ACTION_ID_PATHS: Mapping[int, str] = MappingProxyType({
+    action_id: f"/action/{action_id}" for action_id in REAPER_ACTIONS.values()
+})
+
+# Action name straight to its OSC address
+ACTION_PATHS: Mapping[str, str] = MappingProxyType({
+    name: ACTION_ID_PATHS[action_id] for name, action_id in REAPER_ACTIONS.items()
+})
+
+
+@lru_cache(maxsize=256)
+def _action_path(name: str) -> Optional[str]:
+    """OSC path for an action name, matched case-insensitively. Cached per spelling."""
+    # Exact match first; only lowercase the name on a miss
+    return ACTION_PATHS.get(name) or ACTION_PATHS.get(name.lower())
+
+
+@lru_cache(maxsize=1024)
+def _track_path(track_index: int, param: str) -> str:
+    """OSC address of a track parameter (REAPER numbers tracks from 1). Cached."""
+    return f"/track/{track_index + 1}/{param}"
+
+
+@lru_cache(maxsize=256)
+def _argless_osc_message(address: str) -> Any:
+    """Built OSC message with no arguments (transport, actions). Cached; messages are immutable."""
+    return OscMessageBuilder(address=address).build()
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON; uses orjson when it is installed."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse JSON bytes; uses orjson when it is installed."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _lua_quote(text: str) -> str:
+    """Quote a Python string as a Lua string literal."""
+    escaped = (
+        text.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+        .replace("\0", "\\0")
+    )
+    return f'"{escaped}"'
+
+
+class TrackResult(NamedTuple):
+    """Outcome of creating a track; track_index is -1 on failure."""
+    
+    success: bool
+    message: str
+    track_index: int = -1
+
+
+def _result_track_index(result: Dict[str, Any]) -> Optional[int]:
+    """Track index returned by a Lua script, or None if it reported an error."""
+    if not result.get("success"):
+        return None
+    val = str(result.get("result", "ERROR"))
+    if "ERROR" in val:
+        return None
+    try:
+        idx = int(float(val))
+    except ValueError:
+        return None
+    return idx if idx >= 0 else None
+
+
+def _note_dict_columns(notes: List[Dict]) -> Tuple[List[int], List[float], List[float], List[int]]:
+    """Split note dicts into (pitches, starts, durations, velocities), filling defaults."""
+    return (
+        [int(n.get("pitch", 60)) for n in notes],
+        [float(n.get("start", 0.0)) for n in notes],
+        [float(n.get("duration", 1.0)) for n in notes],
+        [int(n.get("velocity", 100)) for n in notes],
+    )
+
+
+def _pack_notes(
+    pitches: List[int],
+    starts: List[float],
+    durations: List[float],
+    velocities: List[int]
+) -> bytes:
+    """Note columns as consecutive NOTE_RECORD entries."""
+    try:
+        # Generator output already has the right types: no per-value conversion
+        return b"".join(map(NOTE_RECORD.pack, pitches, starts, durations, velocities))
+    except struct.error:
+        # e.g. float pitches or string times from a client; convert as before
+        return b"".join(map(
+            NOTE_RECORD.pack,
+            map(int, pitches), map(float, starts), map(float, durations), map(int, velocities)
+        ))
+
+
+def _lua_insert_notes(notes_path: Path) -> str:
+    """
+    Lua that inserts the notes of a binary notes file into `take`.
+    
+    Positions are in beats, `ppq` per beat. The file holds NOTE_RECORD
+    entries read with string.unpack, so no note data passes through the
+    Lua parser. Leaves the number of notes in `note_count`.
+    """
+    return f"""
+        local notes_path = {_lua_quote(str(notes_path))}
+        local notes_file = assert(io.open(notes_path, "rb"))
+        local data = notes_file:read("a")
+        notes_file:close()
+        local note_count = #data // {NOTE_RECORD.size}
+        for pos = 1, #data, {NOTE_RECORD.size} do
+            local p, s, d, v = string.unpack("{NOTE_RECORD_LUA}", data, pos)
+            local start_ppq = math.floor(s * ppq)
+            local end_ppq = math.floor((s + d) * ppq)
+            reaper.MIDI_InsertNote(take, false, false, start_ppq, end_ppq, 0, p, v, true)
+        end
+        reaper.MIDI_Sort(take)
+    """
 
 
 @dataclass
@@ -70,6 +248,23 @@ class ReaperBridge:
     temp_dir: Path = None
     
     _osc_client: Any = None
+    # Outgoing OSC messages queued by open transaction() blocks
+    _osc_pending: List[Any] = field(default_factory=list, repr=False)
+    # Track values in those messages, remembered once the bundle is sent
+    _osc_pending_values: Dict[Tuple[int, str], float] = field(default_factory=dict, repr=False)
+    _osc_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    # Open transaction() blocks; while non-zero messages are queued, not sent
+    _osc_hold: int = field(default=0, repr=False)
+    # Watch on temp_dir that wakes _read_response when a file is written
+    _inotify: Any = field(default=None, repr=False)
+    # Per-thread batch() state: queued scripts and the list to fill with results
+    _batch: threading.local = field(default_factory=threading.local, repr=False)
+    # command.json holds one command at a time; held for a whole round-trip
+    _command_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    # command.json kept open between commands (opened on first write)
+    _command_fd: Optional[int] = field(default=None, repr=False)
+    # Last value sent per (track index, OSC parameter)
+    _last_track_values: Dict[Tuple[int, str], float] = field(default_factory=dict, repr=False)
     
     def __post_init__(self):
         # Configure OSC from environment or defaults
@@ -85,38 +280,162 @@ class ReaperBridge:
         self.command_file = self.temp_dir / "command.json"
         self.response_file = self.temp_dir / "response.json"
         
+        if HAS_INOTIFY:
+            try:
+                self._inotify = INotify()
+                self._inotify.add_watch(self.temp_dir, inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO)
+            except OSError as e:
+                logger.debug(f"inotify unavailable, polling for responses: {e}")
+                self._inotify = None
+        
         # Initialize OSC client
         if HAS_OSC:
             try:
                 self._osc_client = udp_client.SimpleUDPClient(self.osc_host, self.osc_port)
+                self._enlarge_osc_send_buffer()
                 logger.info(f"OSC client ready: {self.osc_host}:{self.osc_port}")
             except Exception as e:
                 logger.warning(f"OSC init failed: {e}")
                 self._osc_client = None
     
+    def _enlarge_osc_send_buffer(self):
+        """
+        Give the OSC socket a larger kernel send buffer.
+        
+        python-osc's socket is non-blocking, so a burst that fills the
+        default buffer makes sendto fail and the message is lost.
+        """
+        sock = getattr(self._osc_client, "_sock", None)
+        if sock is None:
+            return
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, OSC_SEND_BUFFER)
+        except OSError as e:
+            logger.debug(f"Could not enlarge OSC send buffer: {e}")
+    
     def send_osc(self, address: str, *args) -> bool:
-        """Send an OSC message to REAPER."""
+        """
+        Send an OSC message to REAPER; returns whether it was sent.
+        
+        Inside transaction() the message is queued for the block's bundle
+        instead, and True only means it was queued.
+        """
+        return self._send_osc(address, args)
+    
+    def _send_osc(
+        self,
+        address: str,
+        args: Tuple[Any, ...],
+        track_value: Optional[Tuple[Tuple[int, str], float]] = None
+    ) -> bool:
+        """send_osc, recording track_value as (key, value) in _last_track_values once sent."""
         if not self._osc_client:
             logger.warning("OSC client not available")
             return False
         
         try:
-            self._osc_client.send_message(address, args if args else [])
+            if args:
+                builder = OscMessageBuilder(address=address)
+                for arg in args:
+                    builder.add_arg(arg)
+                message = builder.build()
+            else:
+                message = _argless_osc_message(address)
+        except Exception as e:
+            logger.error(f"OSC send failed: {e}")
+            return False
+        
+        with self._osc_lock:
+            if self._osc_hold:
+                self._osc_pending.append(message)
+                if track_value is not None:
+                    self._osc_pending_values[track_value[0]] = track_value[1]
+                return True
+        if not self._send_osc_messages([message]):
+            return False
+        if track_value is not None:
+            self._last_track_values[track_value[0]] = track_value[1]
+        return True
+    
+    def flush_osc(self) -> bool:
+        """Send all queued OSC messages now, as one datagram."""
+        with self._osc_lock:
+            messages, self._osc_pending = self._osc_pending, []
+            values, self._osc_pending_values = self._osc_pending_values, {}
+        
+        if not messages:
+            return True
+        if not self._send_osc_messages(messages):
+            return False
+        self._last_track_values.update(values)
+        return True
+    
+    def _send_osc_messages(self, messages: List[Any]) -> bool:
+        """Send built OSC messages, bundled when there are several."""
+        try:
+            if len(messages) == 1:
+                self._osc_client.send(messages[0])
+            else:
+                bundle = OscBundleBuilder(IMMEDIATELY)
+                for message in messages:
+                    bundle.add_content(message)
+                self._osc_client.send(bundle.build())
             return True
         except Exception as e:
             logger.error(f"OSC send failed: {e}")
             return False
     
+    @contextmanager
+    def transaction(self):
+        """
+        Deliver every OSC message sent inside the block as one bundle on exit.
+        
+        Blocks may nest; the bundle goes out when the outermost one ends.
+        Lua commands still flush the queue first so REAPER sees the
+        messages before any script that depends on them.
+        """
+        with self._osc_lock:
+            self._osc_hold += 1
+        try:
+            yield self
+        finally:
+            with self._osc_lock:
+                self._osc_hold -= 1
+                held = self._osc_hold
+            if not held:
+                self.flush_osc()
+    
+    def send_osc_bundle(self, messages: List[Tuple[Any, ...]]) -> bool:
+        """
+        Send OSC messages, each given as (address, *args), as one bundle.
+        
+        Suited to restoring a mixer snapshot: every value goes out in a
+        single datagram, including ones equal to what was last sent.
+        """
+        ok = True
+        with self.transaction():
+            for address, *args in messages:
+                ok = self.send_osc(address, *args) and ok
+            with self._osc_lock:
+                outermost = self._osc_hold == 1
+            if outermost:
+                # Send here rather than on exit, so the result is the real one
+                ok = self.flush_osc() and ok
+        return ok
+    
     def trigger_action(self, action_id: int) -> bool:
-        """Trigger a REAPER action by ID."""
-        # OSC format: /action/_ID or /action/ID
-        return self.send_osc(f"/action/{action_id}")
+        """Trigger a REAPER action by ID (an int or an Action member)."""
+        # Actions can add, delete or reorder tracks (or undo doing so)
+        self._forget_track_values()
+        # OSC format: /action/_ID or /action/ID; known actions have a prebuilt address
+        return self.send_osc(ACTION_ID_PATHS.get(action_id) or f"/action/{int(action_id)}")
     
     def trigger_action_by_name(self, name: str) -> bool:
         """Trigger a REAPER action by name."""
-        action_id = REAPER_ACTIONS.get(name.lower())
-        if action_id:
-            return self.trigger_action(action_id)
+        path = _action_path(name)
+        if path:
+            self._forget_track_values()
+            return self.send_osc(path)
         logger.warning(f"Unknown action: {name}")
         return False
     
@@ -156,69 +475,168 @@ class ReaperBridge:
     # TRACKS (OSC native)
     # ==========================================================================
     
+    def _set_track_value(self, track_index: int, param: str, value: float) -> bool:
+        """
+        Send a track parameter over OSC unless it already holds that value.
+        
+        Repeated writes of the same value (common with step-by-step
+        automation) skip the UDP send. Changes made in REAPER itself are not
+        seen here, so a value is only remembered after a successful send
+        (for a transaction(), once its bundle has gone out). Actions and
+        Lua scripts may add or remove tracks, so they clear what is remembered.
+        """
+        key = (track_index, param)
+        last = self._last_track_values.get(key)
+        if last is not None and abs(last - value) < TRACK_VALUE_TOLERANCE:
+            return True
+        
+        return self._send_osc(_track_path(track_index, param), (value,), (key, value))
+    
+    def _forget_track_values(self):
+        """Drop the remembered track values, for when track indices may have moved."""
+        with self._osc_lock:
+            self._last_track_values.clear()
+            self._osc_pending_values.clear()
+    
     def set_track_volume(self, track_index: int, volume: float) -> bool:
         """Set track volume (0.0 to 1.0 normalized)."""
-        # REAPER OSC: /track/N/volume
-        return self.send_osc(f"/track/{track_index + 1}/volume", float(volume))
+        return self._set_track_value(track_index, "volume", float(volume))
     
     def set_track_pan(self, track_index: int, pan: float) -> bool:
         """Set track pan (-1.0 to 1.0)."""
-        return self.send_osc(f"/track/{track_index + 1}/pan", float(pan))
+        return self._set_track_value(track_index, "pan", float(pan))
     
     def set_track_mute(self, track_index: int, muted: bool) -> bool:
         """Mute/unmute track."""
-        return self.send_osc(f"/track/{track_index + 1}/mute", 1 if muted else 0)
+        return self._set_track_value(track_index, "mute", 1 if muted else 0)
     
     def set_track_solo(self, track_index: int, solo: bool) -> bool:
         """Solo/unsolo track."""
-        return self.send_osc(f"/track/{track_index + 1}/solo", 1 if solo else 0)
+        return self._set_track_value(track_index, "solo", 1 if solo else 0)
     
     def set_track_arm(self, track_index: int, armed: bool) -> bool:
         """Arm/disarm track for recording."""
-        return self.send_osc(f"/track/{track_index + 1}/recarm", 1 if armed else 0)
+        return self._set_track_value(track_index, "recarm", 1 if armed else 0)
     
     def select_track(self, track_index: int) -> bool:
         """Select a track."""
-        return self.send_osc(f"/track/{track_index + 1}/select", 1)
+        return self.send_osc(_track_path(track_index, "select"), 1)
     
     # ==========================================================================
     # FILE-BASED COMMANDS (for complex operations)
     # ==========================================================================
     
     def _write_command(self, command: str, params: Dict[str, Any]) -> bool:
-        """Write a command to the file for Lua to pick up."""
+        """
+        Write a command to the file for Lua to pick up.
+        
+        The file stays open, so each command is a truncate and a write
+        rather than an open/write/close. Callers hold _command_lock.
+        """
         try:
             cmd_data = {
                 "command": command,
                 "params": params,
                 "timestamp": time.time()
             }
-            self.command_file.write_text(json.dumps(cmd_data, indent=2))
+            data = _json_dumps(cmd_data)
+            if self._command_fd is not None and os.fstat(self._command_fd).st_nlink == 0:
+                # command.json was deleted (temp cleanup): writes would go nowhere
+                os.close(self._command_fd)
+                self._command_fd = None
+            if self._command_fd is None:
+                flags = os.O_WRONLY | os.O_CREAT | getattr(os, "O_BINARY", 0)
+                self._command_fd = os.open(self.command_file, flags, 0o644)
+            # Truncate first: a read mid-write then lacks the timestamp (written
+            # last) and the poller skips it until the command is complete
+            os.ftruncate(self._command_fd, 0)
+            os.lseek(self._command_fd, 0, os.SEEK_SET)
+            os.write(self._command_fd, data)
             return True
         except Exception as e:
             logger.error(f"Failed to write command: {e}")
             return False
     
-    def _read_response(self, timeout: float = 2.0) -> Optional[Dict[str, Any]]:
-        """Read response from Lua script."""
-        start = time.time()
-        
-        # Clear old response
-        if self.response_file.exists():
-            self.response_file.unlink()
+    def __del__(self):
+        """Close command.json if it was opened."""
+        if self._command_fd is not None:
+            try:
+                os.close(self._command_fd)
+            except OSError:
+                pass
+    
+    def _read_response(
+        self,
+        timeout: float = 2.0,
+        response_file: Optional[Path] = None,
+        started_file: Optional[Path] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Wait for the Lua script's response and consume it.
         
-        while time.time() - start < timeout:
-            if self.response_file.exists():
-                try:
-                    data = json.loads(self.response_file.read_text())
-                    return data
-                except:
-                    pass
-            time.sleep(0.05)
+        Returns as soon as the file holds valid JSON, or None on timeout.
+        A response that still fails to parse after RESPONSE_SETTLE_DELAY
+        without changing size is returned as a failure with its raw text.
+        The caller must make sure no stale response exists before writing
+        the command. If started_file exists when the timeout runs out, the
+        poller is still running the command and the wait is extended once
+        by COMMAND_RUN_TIMEOUT. With inotify the wait blocks until a file
+        in temp_dir is written; otherwise the file is polled with backoff.
+        """
+        path = response_file or self.response_file
+        deadline = time.monotonic() + timeout
+        extended = False
+        delay = RESPONSE_POLL_MIN
+        # Size of the response when it last failed to parse
+        invalid_size = -1
         
-        return None
-    
-    def create_track(self, name: str = "New Track") -> Dict[str, Any]:
+        while True:
+            if time.monotonic() >= deadline:
+                if extended or started_file is None or not started_file.exists():
+                    return None
+                logger.debug(f"Command still running after {timeout}s; waiting up to {COMMAND_RUN_TIMEOUT}s more")
+                deadline = time.monotonic() + COMMAND_RUN_TIMEOUT
+                extended = True
+            
+            try:
+                raw = path.read_bytes()
+            except OSError:
+                # Not written yet: wait for a write, or back off
+                if self._inotify is not None:
+                    self._wait_for_write(deadline)
+                else:
+                    time.sleep(delay)
+                    delay = min(delay * 2, RESPONSE_POLL_MAX)
+                continue
+            
+            try:
+                data = _json_loads(raw)
+            except ValueError:
+                if len(raw) != invalid_size:
+                    # Caught mid-write: check again once the write has had time to finish
+                    invalid_size = len(raw)
+                    time.sleep(RESPONSE_SETTLE_DELAY)
+                    continue
+                # Same size as last time: complete, but not valid JSON
+                data = {
+                    "success": False,
+                    "message": f"Unreadable response from REAPER: {raw.decode('utf-8', 'replace')}",
+                }
+            
+            try:
+                path.unlink()
+            except OSError:
+                pass
+            return data
+    
+    def _wait_for_write(self, deadline: float):
+        """Block until any file in temp_dir is written or moved in, or the deadline passes."""
+        remaining_ms = int((deadline - time.monotonic()) * 1000)
+        if remaining_ms > 0:
+            # Events for other files just cause one extra check of the response
+            self._inotify.read(timeout=remaining_ms)
+    
+    def create_track(self, name: str = "New Track") -> TrackResult:
         """Create a new track via Lua for strict synchronous execution."""
         # We use a Lua script to insert the track at the end and return its index
         lua_code = f"""
@@ -227,7 +645,7 @@ class ReaperBridge:
         reaper.InsertTrackAtIndex(idx, true)
         local track = reaper.GetTrack(0, idx)
         if track then
-            reaper.GetSetMediaTrackInfo_String(track, "P_NAME", "{name}", true)
+            reaper.GetSetMediaTrackInfo_String(track, "P_NAME", {_lua_quote(name)}, true)
             reaper.TrackList_AdjustWindows(false)
             reaper.UpdateArrange()
             return idx
@@ -236,33 +654,21 @@ class ReaperBridge:
         """
         # We use execute_lua which waits for response
         result = self.execute_lua(lua_code)
+        track_index = _result_track_index(result)
+        if track_index is None:
+            return TrackResult(False, f"Failed to create track via Lua. Res: {result}")
         
-        # Check result
-        if result.get("success"):
-            val = result.get("result", "ERROR")
-            if "ERROR" not in str(val) and "DEBUG" not in str(val):
-                try:
-                    idx = int(float(str(val)))
-                    if idx >= 0:
-                        return {
-                            "success": True, 
-                            "message": f"Created track: {name}", 
-                            "track_index": idx
-                        }
-                except ValueError:
-                    pass
-        
-        return {"success": False, "message": f"Failed to create track via Lua. Res: {result}"}
+        return TrackResult(True, f"Created track: {name}", track_index)
     
     def insert_midi_item(self, track_index: int, position: float, length: float) -> Dict[str, Any]:
         """Insert MIDI item via direct Lua execution for consistency."""
         lua_code = f"""
-        local track = reaper.GetTrack(0, {track_index})
+        local track = reaper.GetTrack(0, {int(track_index)})
         if not track then return "ERROR: Track not found" end
         
         local tempo = reaper.Master_GetTempo()
-        local pos_sec = {position} * (60 / tempo)
-        local len_sec = {length} * (60 / tempo)
+        local pos_sec = {float(position)} * (60 / tempo)
+        local len_sec = {float(length)} * (60 / tempo)
         
         local item = reaper.CreateNewMIDIItemInProj(track, pos_sec, pos_sec + len_sec, false)
         if item then
@@ -272,7 +678,7 @@ class ReaperBridge:
             end
             reaper.UpdateArrange()
             reaper.TrackList_AdjustWindows(false)
-            return "Success: Item Created on Track " .. {track_index}
+            return "Success: Item Created on Track " .. {int(track_index)}
         end
         return "ERROR: Failed to create item"
         """
@@ -284,99 +690,266 @@ class ReaperBridge:
              return result
         return {"success": False, "message": f"Failed to insert item. Res: {result}"}
     
-    def add_notes(self, track_index: int, item_index: int, notes: List[Dict]) -> Dict[str, Any]:
-        """Add MIDI notes via execute_lua to bypass complex JSON parsing."""
-        
-        # Construct Lua table of notes
-        # Each note: {pitch, start, duration, velocity}
-        # We'll generate a Lua script that iterates this
+    def create_track_with_midi(
+        self,
+        name: str,
+        position: float,
+        length: float,
+        pitches: List[int],
+        starts: List[float],
+        durations: List[float],
+        velocities: List[int]
+    ) -> TrackResult:
+        """
+        Create a track holding one MIDI item filled with notes.
         
-        lua_notes = []
-        for n in notes:
-            # pitch, start(beats), duration(beats), velocity
-            pitch = int(n.get("pitch", 60))
-            start = float(n.get("start", 0.0))
-            dur = float(n.get("duration", 1.0))
-            vel = int(n.get("velocity", 100))
-            lua_notes.append(f"{{p={pitch},s={start},d={dur},v={vel}}}")
+        Track, item and notes are created by a single Lua script, so the
+        whole operation is one round-trip and REAPER redraws once at the end.
+        Position, length and note times are in beats; notes are given as
+        parallel columns.
+        """
+        with self._notes_file(pitches, starts, durations, velocities) as notes_path:
+            lua_code = f"""
+            reaper.PreventUIRefresh(1)
+            local idx = reaper.CountTracks(0)
+            reaper.InsertTrackAtIndex(idx, true)
+            local track = reaper.GetTrack(0, idx)
+            if not track then
+                reaper.PreventUIRefresh(-1)
+                return "ERROR: Track not found after insert at " .. tostring(idx)
+            end
+            reaper.GetSetMediaTrackInfo_String(track, "P_NAME", {_lua_quote(name)}, true)
+            
+            local tempo = reaper.Master_GetTempo()
+            local pos_sec = {float(position)} * (60 / tempo)
+            local len_sec = {float(length)} * (60 / tempo)
+            local item = reaper.CreateNewMIDIItemInProj(track, pos_sec, pos_sec + len_sec, false)
+            local take = item and reaper.GetActiveTake(item)
+            if not take then
+                reaper.PreventUIRefresh(-1)
+                return "ERROR: Failed to create item"
+            end
+            reaper.GetSetMediaItemTakeInfo_String(take, "P_NAME", "Generated MIDI", true)
+            
+            local ppq = 960 -- Standard resolution
+            {_lua_insert_notes(notes_path)}
+            
+            reaper.PreventUIRefresh(-1)
+            reaper.TrackList_AdjustWindows(false)
+            reaper.UpdateArrange()
+            return idx
+            """
+            
+            result = self.execute_lua(lua_code)
+        track_index = _result_track_index(result)
+        if track_index is None:
+            return TrackResult(False, f"Failed to create track via Lua. Res: {result}")
         
-        notes_str = "{" + ",".join(lua_notes) + "}"
+        # The MIDI item is the track's first (index 0)
+        return TrackResult(True, f"Created track: {name}", track_index)
+    
+    def add_notes(self, track_index: int, item_index: int, notes: List[Dict]) -> Dict[str, Any]:
+        """Add MIDI notes given as dicts (pitch, start, duration, velocity)."""
+        return self.add_notes_columns(track_index, item_index, *_note_dict_columns(notes))
+    
+    def add_notes_columns(
+        self,
+        track_index: int,
+        item_index: int,
+        pitches: List[int],
+        starts: List[float],
+        durations: List[float],
+        velocities: List[int]
+    ) -> Dict[str, Any]:
+        """
+        Add MIDI notes given as parallel columns, via execute_lua.
         
-        lua_code = f"""
-        local log = ""
-        local function debug(msg) log = log .. msg .. "\\n" end
+        All notes go to REAPER in one Lua script: a single round-trip,
+        one MIDI_Sort, and no UI refresh until the whole batch is in.
+        """
+        if not len(pitches) == len(starts) == len(durations) == len(velocities):
+            return {"success": False, "message": "Note columns must all have the same length"}
         
-        debug("Start add_notes for Track " .. {track_index} .. " Item " .. {item_index})
-        local track = reaper.GetTrack(0, {track_index})
-        if track then
-            debug("Track found")
-            local item = reaper.GetTrackMediaItem(track, {item_index})
-            if item then
-                debug("Item found")
-                local take = reaper.GetActiveTake(item)
-                if take then
-                    debug("Take found")
-                    local ppq = 960 -- Standard resolution
-                    local notes = {notes_str}
-                    debug("Processing " .. #notes .. " notes")
-                    
-                    local count = 0
-                    for i, note in ipairs(notes) do
-                        local start_ppq = math.floor(note.s * ppq)
-                        local end_ppq = math.floor((note.s + note.d) * ppq)
-                        reaper.MIDI_InsertNote(take, false, false, start_ppq, end_ppq, 0, note.p, note.v, true)
-                        count = count + 1
-                    end
-                    debug("Inserted " .. count .. " notes")
-                    
-                    reaper.MIDI_Sort(take)
-                    reaper.UpdateArrange()
-                    return "Success: " .. log
-                else
-                    return "ERROR: No active take on item"
-                end
-            else
+        with self._notes_file(pitches, starts, durations, velocities) as notes_path:
+            lua_code = f"""
+            local track = reaper.GetTrack(0, {int(track_index)})
+            if not track then return "ERROR: Track " .. {int(track_index)} .. " not found" end
+            
+            local item = reaper.GetTrackMediaItem(track, {int(item_index)})
+            if not item then
                 local cnt = reaper.CountTrackMediaItems(track)
-                return "ERROR: Item " .. {item_index} .. " not found. Track has " .. cnt .. " items."
+                return "ERROR: Item " .. {int(item_index)} .. " not found. Track has " .. cnt .. " items."
             end
-        else
-            return "ERROR: Track " .. {track_index} .. " not found"
+            
+            local take = reaper.GetActiveTake(item)
+            if not take then return "ERROR: No active take on item" end
+            
+            local ppq = 960 -- Standard resolution
+            
+            reaper.PreventUIRefresh(1)
+            {_lua_insert_notes(notes_path)}
+            reaper.PreventUIRefresh(-1)
+            reaper.UpdateArrange()
+            return "Success: Inserted " .. note_count .. " notes"
+            """
+            
+            return self.execute_lua(lua_code)
+    
+    @contextmanager
+    def _notes_file(
+        self,
+        pitches: List[int],
+        starts: List[float],
+        durations: List[float],
+        velocities: List[int]
+    ):
+        """Write note columns to a binary notes file for _lua_insert_notes; removed afterwards."""
+        path = self.temp_dir / f"notes_{uuid.uuid4().hex}.bin"
+        path.write_bytes(_pack_notes(pitches, starts, durations, velocities))
+        try:
+            yield path
+        finally:
+            # A batched script runs when the batch exits, so the batch removes it then
+            files = getattr(self._batch, "files", None)
+            if files is not None:
+                files.append(path)
+            else:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+    
+    @contextmanager
+    def batch(self):
+        """
+        Run every Lua script issued in the block as one round-trip.
+        
+        Bridge calls inside the block return at once without results (track
+        creation reports failure, having no index yet). When the block exits
+        the scripts run in order, each in its own function under pcall, and
+        the yielded list is filled with their return values as strings;
+        failures start with "ERROR". Nested blocks join the outer batch. If
+        the block raises, nothing is sent.
+        """
+        if getattr(self._batch, "scripts", None) is not None:
+            yield self._batch.results
+            return
+        
+        results: List[str] = []
+        files: List[Path] = []
+        self._batch.scripts = []
+        self._batch.results = results
+        self._batch.files = files
+        try:
+            try:
+                yield results
+            finally:
+                scripts = self._batch.scripts
+                self._batch.scripts = None
+                self._batch.results = None
+                self._batch.files = None
+            
+            if scripts:
+                results.extend(self._run_batch(scripts))
+        finally:
+            for path in files:
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+    
+    def _run_batch(self, scripts: List[str]) -> List[str]:
+        """Execute queued scripts in one Lua chunk; one result string per script."""
+        ops = "\n".join(
+            f"results[{i}] = run(function()\n{code}\nend)"
+            for i, code in enumerate(scripts, 1)
+        )
+        lua_code = f"""
+        local results = {{}}
+        local function run(op)
+            local ok, r = pcall(op)
+            if not ok then return "ERROR: " .. tostring(r) end
+            return (tostring(r):gsub("\\n", " "))
         end
+        {ops}
+        return table.concat(results, "\\n")
         """
         
-        return self.execute_lua(lua_code)
+        response = self.execute_lua(lua_code)
+        if not response.get("success") or "result" not in response:
+            error = response.get("error") or response.get("message", "no result")
+            return [f"ERROR: {error}"] * len(scripts)
+        return str(response["result"]).split("\n")
     
-    def execute_lua(self, code: str) -> Dict[str, Any]:
-        """Execute Lua code in REAPER via file transfer (robust)."""
-        # Write code to a temp file
-        import uuid
-        code_filename = f"lua_{uuid.uuid4().hex}.lua"
-        code_path = self.temp_dir / code_filename
-        code_path.write_text(code, encoding="utf-8")
+    def execute_lua(self, code: str, timeout: float = 5.0) -> Dict[str, Any]:
+        """
+        Execute Lua code in REAPER via file transfer (robust).
+        
+        timeout is how long REAPER has to pick the script up and answer; a
+        script it has started gets up to COMMAND_RUN_TIMEOUT more to finish.
+        """
+        # Scripts create, delete and reorder tracks: remembered values by index go stale
+        self._forget_track_values()
+        
+        # Inside batch() the script is queued and sent when the block exits
+        scripts = getattr(self._batch, "scripts", None)
+        if scripts is not None:
+            scripts.append(code)
+            return {"success": True, "message": "Queued in batch"}
+        
+        # Script, ack and started marker are unique to this call: we return as
+        # soon as REAPER is done, never read another call's response, and a
+        # command left over from a timed-out call can't run this call's code.
+        # The poller touches started_path when it begins running the script
+        call_id = uuid.uuid4().hex
+        code_path = self.temp_dir / f"lua_{call_id}.lua"
+        ack_path = self.temp_dir / f"ack_{call_id}.json"
+        started_path = self.temp_dir / f"started_{call_id}"
         
-        # Send path to REAPER
-        self._write_command("run_lua_file", {"path": str(code_path)})
+        # Queued OSC (tempo, mixer) must reach REAPER before the script runs
+        self.flush_osc()
         
-        response = self._read_response(timeout=5.0)
+        # Send the script's path to REAPER; concurrent callers queue here so a
+        # command is never overwritten before the poller has picked it up
+        code_path.write_text(code, encoding="utf-8")
+        with self._command_lock:
+            self._write_command("run_lua_file", {
+                "path": str(code_path),
+                "response_path": str(ack_path),
+                "started_path": str(started_path),
+            })
+            
+            response = self._read_response(timeout=timeout, response_file=ack_path, started_file=started_path)
+        
+        started = started_path.exists()
         
         # Cleanup
-        try:
-            code_path.unlink()
-        except:
-            pass
+        for path in (code_path, ack_path, started_path):
+            try:
+                path.unlink()
+            except OSError:
+                pass
             
         if response:
             return response
-        return {"success": True, "message": "Lua file execution sent"}
+        if not started:
+            return {
+                "success": False,
+                "message": f"REAPER did not pick up the script within {timeout}s. Is scythe_poller.lua running?",
+            }
+        return {"success": False, "message": "Script started in REAPER but did not finish in time"}
 
 
-# Global instance
+# Global instance; the lock makes sure concurrent first calls build only one
 _bridge: Optional[ReaperBridge] = None
+_bridge_lock = threading.Lock()
 
 
 def get_bridge() -> ReaperBridge:
     """Get or create the REAPER bridge."""
     global _bridge
     if _bridge is None:
-        _bridge = ReaperBridge()
+        with _bridge_lock:
+            if _bridge is None:
+                _bridge = ReaperBridge()
     return _bridge
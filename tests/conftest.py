@@ -0,0 +1,153 @@
+import subprocess
+import json
+import os
+import shlex
+import shutil
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Path to the server entry point or command; --project lets it run from any cwd.
+# SCYTHE_TEST_SERVER_CMD overrides it, e.g. "scythe-mcp" for an installed script.
+SERVER_CMD = shlex.split(os.environ.get("SCYTHE_TEST_SERVER_CMD", "")) or [
+    "uv", "run", "--project", str(PROJECT_ROOT), "scythe-mcp"
+]
+
+# Pipe buffer for the server's stdin/stdout, and the most read from it at once (bytes)
+PIPE_SIZE = 1 << 20
+READ_SIZE = 1 << 16
+
+# Seconds to let the server exit on its own before it is terminated
+SHUTDOWN_TIMEOUT = 1
+
+def frame(req):
+    """A JSON-RPC message as one newline-terminated line of bytes."""
+    return json.dumps(req).encode("utf-8") + b"\n"
+
+# The fixed handshake messages, encoded once
+INITIALIZE_FRAME = frame({
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2024-11-05", # FastMCP version dependent, usually accepts recent
+        "capabilities": {},
+        "clientInfo": {"name": "TestClient", "version": "1.0"}
+    }
+})
+INITIALIZED_FRAME = frame({
+    "jsonrpc": "2.0",
+    "method": "notifications/initialized"
+})
+
+
+class MCPServer:
+    """A running MCP server process, spoken to over stdio."""
+
+    def __init__(self, process):
+        self.process = process
+        # Responses by request id; notifications and server requests are dropped
+        self.responses = {}
+        self.arrived = threading.Condition()
+        self.decoder = json.JSONDecoder()
+        reader = threading.Thread(target=self._read_output, daemon=True)
+        reader.start()
+
+    def _read_output(self):
+        # Output is read in bulk and split into lines here, not by readline
+        buf = bytearray()
+        read = self.process.stdout.read1
+        while True:
+            chunk = read(READ_SIZE)
+            if not chunk:
+                break
+            buf.extend(chunk)
+            start = 0
+            end = buf.find(b"\n")
+            while end != -1:
+                self._handle_line(buf[start:end].decode("utf-8", "replace"))
+                start = end + 1
+                end = buf.find(b"\n", start)
+            del buf[:start]
+        self.process.stdout.close()
+
+    def _handle_line(self, line):
+        # Only responses are stored, so waiting callers wake for nothing else
+        print(f"<- RECV: {line.strip()}")
+        # A line may hold several messages, or a log prefix before one
+        pos = line.find("{")
+        while pos != -1:
+            try:
+                msg, end = self.decoder.raw_decode(line, pos)
+            except json.JSONDecodeError:
+                pos = line.find("{", pos + 1)
+                continue
+            if isinstance(msg, dict) and "id" in msg and "method" not in msg:
+                with self.arrived:
+                    self.responses[msg["id"]] = msg
+                    self.arrived.notify_all()
+            pos = line.find("{", end)
+
+    def send(self, *messages):
+        """Send messages (dicts or encoded frames) pipelined, in one write."""
+        req_frames = [m if isinstance(m, bytes) else frame(m) for m in messages]
+        for req_frame in req_frames:
+            print(f"\n-> SEND: {req_frame.decode('utf-8').strip()}")
+        self.process.stdin.write(b"".join(req_frames))
+        self.process.stdin.flush()
+
+    def recv(self, request_id, timeout=5):
+        """The response to request_id, or None after timeout seconds."""
+        with self.arrived:
+            self.arrived.wait_for(lambda: request_id in self.responses, timeout)
+            return self.responses.pop(request_id, None)
+
+
+@pytest.fixture(scope="session")
+def mcp_server(tmp_path_factory):
+    """An initialized MCP server, started once and shared by every test."""
+    if shutil.which(SERVER_CMD[0]) is None:
+        pytest.skip(f"{SERVER_CMD[0]} not installed")
+    print(f"Starting MCP Server: {' '.join(SERVER_CMD)}")
+    # A private working directory, so concurrent runs don't share one
+    working_dir = os.environ.get("SCYTHE_TEST_CWD") or tmp_path_factory.mktemp("scythe_mcp")
+
+    # Start the server process
+    process = subprocess.Popen(
+        SERVER_CMD,
+        cwd=working_dir,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=sys.stderr, # Pipe stderr to console for debugging
+        bufsize=-1, # Block buffered bytes; decoded per line by the reader
+        pipesize=PIPE_SIZE, # Windows anonymous pipes default to a few KiB
+        creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0) # No console window (Windows only)
+    )
+    server = MCPServer(process)
+
+    try:
+        # The initialized notification is pipelined behind initialize
+        server.send(INITIALIZE_FRAME, INITIALIZED_FRAME)
+
+        init_response = server.recv(1)
+        assert init_response, "No response to initialize"
+        assert "result" in init_response, f"Initialize failed: {init_response}"
+        print("Initialized!")
+
+        yield server
+    finally:
+        print("\nClosing server...")
+        # MCP has no shutdown message; a stdio server exits when stdin hits EOF
+        try:
+            process.stdin.close()
+            process.wait(timeout=SHUTDOWN_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired):
+            process.terminate()
+            try:
+                process.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                process.kill()
@@ -0,0 +1,249 @@
+import json
+import struct
+import threading
+
+import pytest
+from pythonosc.osc_bundle import OscBundle
+
+from scythe_mcp.server import reaper_bridge
+from scythe_mcp.server.reaper_bridge import (
+    NOTE_RECORD, NOTE_RECORD_LUA, Action, ReaperBridge, _lua_quote, _pack_notes
+)
+
+
+class FakeOSCClient:
+    """Records what would go out over UDP; raises while `fail` is set."""
+
+    def __init__(self):
+        self.sent = []
+        self.fail = False
+
+    def send(self, content):
+        if self.fail:
+            raise OSError("send failed")
+        self.sent.append(content)
+
+
+@pytest.fixture
+def bridge(tmp_path):
+    """A bridge whose command files live in tmp_path, with a fake OSC client."""
+    bridge = ReaperBridge()
+    bridge.temp_dir = tmp_path
+    bridge.command_file = tmp_path / "command.json"
+    bridge.response_file = tmp_path / "response.json"
+    bridge._inotify = None
+    bridge._osc_client = FakeOSCClient()
+    return bridge
+
+
+def fake_poller(bridge, respond):
+    """
+    Stand in for scythe_poller.lua: each command written is run at once.
+
+    respond(code) gives the ack dict, or None to leave the command unanswered.
+    Returns the list of commands seen.
+    """
+    commands = []
+
+    def write_command(command, params):
+        commands.append((command, params))
+        with open(params["path"], encoding="utf-8") as f:
+            response = respond(f.read())
+        if response is not None:
+            open(params["started_path"], "w").close()
+            with open(params["response_path"], "w") as f:
+                json.dump(response, f)
+        return True
+
+    bridge._write_command = write_command
+    return commands
+
+
+# =============================================================================
+# RESPONSES
+# =============================================================================
+
+def test_read_response_consumes_ack(bridge, tmp_path):
+    """A complete ack is returned and removed."""
+    ack = tmp_path / "ack_1.json"
+    ack.write_text('{"success": true, "result": "3"}')
+    assert bridge._read_response(timeout=1, response_file=ack) == {"success": True, "result": "3"}
+    assert not ack.exists()
+
+
+def test_read_response_reports_unparseable_ack(bridge, tmp_path):
+    """An ack that never parses fails with its text instead of timing out."""
+    raw = '{"success": false, "error": "[string "x"]:1: boom"}'
+    ack = tmp_path / "ack_1.json"
+    ack.write_text(raw)
+    response = bridge._read_response(timeout=30, response_file=ack)
+    assert response["success"] is False
+    assert raw in response["message"]
+
+
+def test_read_response_waits_longer_once_started(bridge, tmp_path, monkeypatch):
+    """The started marker extends the wait; without it the call times out."""
+    monkeypatch.setattr(reaper_bridge, "COMMAND_RUN_TIMEOUT", 5.0)
+    ack = tmp_path / "ack_1.json"
+    started = tmp_path / "started_1"
+    assert bridge._read_response(timeout=0.05, response_file=ack, started_file=started) is None
+
+    started.touch()
+    timer = threading.Timer(0.2, ack.write_text, ['{"success": true}'])
+    timer.start()
+    try:
+        assert bridge._read_response(timeout=0.05, response_file=ack, started_file=started) == {"success": True}
+    finally:
+        timer.cancel()
+
+
+# =============================================================================
+# EXECUTE LUA / BATCH
+# =============================================================================
+
+def test_execute_lua_uses_per_call_files(bridge, tmp_path):
+    """Each call gets its own script, ack and started file, all removed afterwards."""
+    commands = fake_poller(bridge, lambda code: {"success": True, "result": code})
+    assert bridge.execute_lua("return 1")["result"] == "return 1"
+    assert bridge.execute_lua("return 2")["result"] == "return 2"
+
+    (_, first), (_, second) = commands
+    assert first["path"] != second["path"]
+    assert first["response_path"] != second["response_path"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_execute_lua_reports_poller_not_running(bridge, tmp_path):
+    """An unanswered command says the script was never picked up."""
+    fake_poller(bridge, lambda code: None)
+    response = bridge.execute_lua("return 1", timeout=0.05)
+    assert response["success"] is False
+    assert "did not pick up" in response["message"]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_batch_runs_scripts_in_one_call(bridge):
+    """Scripts issued in a batch (nested or not) go out as one call, one result each."""
+    commands = fake_poller(bridge, lambda code: {"success": True, "result": "1\nERROR: boom"})
+    with bridge.batch() as results:
+        assert bridge.execute_lua("return 1")["message"] == "Queued in batch"
+        with bridge.batch():
+            bridge.execute_lua("error('boom')")
+        assert not commands
+    assert len(commands) == 1
+    assert results == ["1", "ERROR: boom"]
+
+
+def test_batch_sends_nothing_when_block_raises(bridge):
+    """A batch that raises is discarded."""
+    commands = fake_poller(bridge, lambda code: {"success": True, "result": "1"})
+    with pytest.raises(RuntimeError):
+        with bridge.batch():
+            bridge.execute_lua("return 1")
+            raise RuntimeError
+    assert not commands
+
+
+def test_batch_failure_fails_every_script(bridge):
+    """When the batch call itself fails, each script gets the error."""
+    fake_poller(bridge, lambda code: {"success": False, "error": "Syntax error"})
+    with bridge.batch() as results:
+        bridge.execute_lua("return 1")
+        bridge.execute_lua("return 2")
+    assert results == ["ERROR: Syntax error"] * 2
+
+
+# =============================================================================
+# NOTES AND LUA LITERALS
+# =============================================================================
+
+def test_note_record_matches_lua_layout():
+    """NOTE_RECORD and the Lua string.unpack format describe the same 20 bytes."""
+    # Lua's i2 is a 2-byte signed int: struct's h
+    assert NOTE_RECORD.format == NOTE_RECORD_LUA.replace("i2", "h")
+    assert NOTE_RECORD.size == 20
+
+
+def test_pack_notes_converts_loose_types():
+    """Client-supplied floats and strings pack like generator output."""
+    expected = NOTE_RECORD.pack(60, 0.5, 1.0, 100) + NOTE_RECORD.pack(62, 1.5, 0.25, 90)
+    assert _pack_notes([60, 62], [0.5, 1.5], [1.0, 0.25], [100, 90]) == expected
+    assert _pack_notes([60.0, "62"], ["0.5", 1.5], [1, "0.25"], [100.0, "90"]) == expected
+    assert list(struct.iter_unpack("<hddh", expected)) == [(60, 0.5, 1.0, 100), (62, 1.5, 0.25, 90)]
+
+
+def test_lua_quote_escapes_specials():
+    """Quotes, backslashes and line breaks can't end or break the literal."""
+    assert _lua_quote('say "hi"\\\n\r\0') == '"say \\"hi\\"\\\\\\n\\r\\0"'
+
+
+# =============================================================================
+# OSC
+# =============================================================================
+
+def test_osc_sends_at_once_outside_transaction(bridge):
+    """send_osc delivers immediately and reports the real outcome."""
+    client = bridge._osc_client
+    assert bridge.play()
+    assert len(client.sent) == 1
+    client.fail = True
+    assert not bridge.stop()
+
+
+def test_transaction_sends_one_bundle(bridge):
+    """Messages inside nested transactions go out together when the outermost ends."""
+    client = bridge._osc_client
+    with bridge.transaction():
+        bridge.set_tempo(120)
+        with bridge.transaction():
+            bridge.play()
+        assert client.sent == []
+    assert len(client.sent) == 1
+    assert isinstance(client.sent[0], OscBundle)
+
+
+def test_send_osc_bundle_reports_send_failure(bridge):
+    """send_osc_bundle's result reflects the send, not the queueing."""
+    assert bridge.send_osc_bundle([("/play",), ("/tempo/raw", 90.0)])
+    bridge._osc_client.fail = True
+    assert not bridge.send_osc_bundle([("/play",), ("/tempo/raw", 90.0)])
+
+
+def test_repeated_track_value_skips_send(bridge):
+    """Setting a track to the value it was last sent doesn't send again."""
+    client = bridge._osc_client
+    assert bridge.set_track_volume(0, 0.5)
+    assert bridge.set_track_volume(0, 0.5)
+    assert len(client.sent) == 1
+
+
+def test_track_value_forgotten_when_bundle_fails(bridge):
+    """A value queued in a transaction that failed to send is sent again later."""
+    client = bridge._osc_client
+    client.fail = True
+    with bridge.transaction():
+        bridge.set_track_volume(0, 0.5)
+    client.fail = False
+    assert bridge.set_track_volume(0, 0.5)
+    assert len(client.sent) == 1
+
+
+def test_track_value_resent_after_track_deleted(bridge):
+    """Deleting a track shifts indices, so the same value is sent again."""
+    client = bridge._osc_client
+    assert bridge.set_track_volume(0, 0.5)
+    assert bridge.trigger_action(Action.DELETE_TRACK)
+    assert bridge.set_track_volume(0, 0.5)
+    assert bridge.trigger_action_by_name("undo")
+    assert bridge.set_track_volume(0, 0.5)
+    assert len(client.sent) == 5
+
+
+def test_track_value_resent_after_track_created(bridge):
+    """Track creation runs a script, which may move tracks; values are sent again."""
+    client = bridge._osc_client
+    fake_poller(bridge, lambda code: {"success": True, "result": "0"})
+    assert bridge.set_track_volume(0, 0.5)
+    assert bridge.create_track("Drums").success
+    assert bridge.set_track_volume(0, 0.5)
+    assert len(client.sent) == 2
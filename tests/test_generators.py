@@ -0,0 +1,68 @@
+import random
+
+from scythe_mcp.generators.drums import generate_drum_pattern
+from scythe_mcp.generators.basslines import generate_bassline
+from scythe_mcp.generators.melodies import generate_melody, generate_arpeggio
+from scythe_mcp.music_theory.chords import parse_chord
+from scythe_mcp.music_theory.rhythm import create_straight_pattern, create_syncopated_pattern, set_seed
+
+
+def test_seeded_drum_pattern_is_reproducible():
+    """Same seed gives the same notes; bpm and variation don't change them."""
+    first = generate_drum_pattern(genre="trap", bars=4, seed=7)
+    second = generate_drum_pattern(genre="Trap", bars=4, bpm=90, variation="complex", seed=7)
+    assert first.to_midi_notes() == second.to_midi_notes()
+    assert second.bpm == 90
+    assert second.name == "trap_complex"
+
+
+def test_injected_rng_is_reproducible():
+    """Generators draw only from the rng they are given."""
+    chords = [parse_chord("Cm7"), parse_chord("F7")]
+    for make in (
+        lambda rng: generate_drum_pattern(genre="trap", rng=rng).to_midi_notes(),
+        lambda rng: generate_bassline(chords, style="walking", rng=rng).to_dict_list(),
+        lambda rng: generate_melody(key="D", scale_type="dorian", rng=rng).to_dict_list(),
+        lambda rng: generate_arpeggio(chords[0], pattern="random", rng=rng).to_dict_list(),
+        lambda rng: create_syncopated_pattern(beats=8, rng=rng).to_dict_list(),
+        lambda rng: create_straight_pattern(subdivision="sixteenth").humanize(rng=rng).to_dict_list(),
+    ):
+        assert make(random.Random(3)) == make(random.Random(3))
+
+
+def test_rhythm_set_seed_is_reproducible():
+    """The shared rhythm RNG replays after reseeding."""
+    set_seed(11)
+    first = create_syncopated_pattern(beats=8).to_dict_list()
+    set_seed(11)
+    assert create_syncopated_pattern(beats=8).to_dict_list() == first
+
+
+def test_soa_columns_match_note_dicts():
+    """to_soa() carries the same notes, in order, as the dict output."""
+    chords = [parse_chord("Am"), parse_chord("F")]
+    drums = generate_drum_pattern(genre="trap", seed=5)
+    bass = generate_bassline(chords, style="walking", rng=random.Random(5))
+    melody = generate_melody(key="A", scale_type="minor", rng=random.Random(5))
+    for columns, dicts in (
+        (drums.to_soa(), drums.to_midi_notes()),
+        (bass.to_soa(), bass.to_dict_list()),
+        (melody.to_soa(), melody.to_dict_list()),
+    ):
+        assert list(zip(*columns)) == [
+            (n["pitch"], n["start"], n["duration"], n["velocity"]) for n in dicts
+        ]
+
+
+def test_seeded_bass_and_melody_are_cached_copies():
+    """Seeds replay the injected-rng output; callers get their own note lists."""
+    chords = [parse_chord("Dm7"), parse_chord("G7")]
+    bass = generate_bassline(chords, style="walking", seed=4)
+    assert bass.to_dict_list() == generate_bassline(chords, style="walking", rng=random.Random(4)).to_dict_list()
+    melody = generate_melody(key="F", seed=4)
+    assert melody.to_dict_list() == generate_melody(key="F", rng=random.Random(4)).to_dict_list()
+    
+    bass.notes.clear()
+    melody.notes.clear()
+    assert generate_bassline(chords, style="walking", seed=4).notes
+    assert generate_melody(key="F", seed=4).notes
@@ -1,4 +1,3 @@
-import time
 import sys
 import os
 from pathlib import Path
@@ -13,6 +12,15 @@ from scythe_mcp.generators.melodies import generate_melody
 from scythe_mcp.music_theory.chords import parse_chord
 from scythe_mcp.music_theory.scales import Scale
 
+def report(label, results):
+    """Print the batch's script results; REAPER has finished them by now."""
+    failures = [r for r in results if r.startswith("ERROR")]
+    if failures:
+        print(f"{label} failed: {failures}")
+    else:
+        print(f"{label}: {results[-1]}")
+    return not failures
+
 def main():
     print("Connecting to REAPER...")
     bridge = get_bridge()
@@ -24,9 +32,6 @@ def main():
     # 2. DRUMS
     print("\n--- Generating Drums (HipHop) ---")
     drum_track_name = "MCP Drums"
-    bridge.create_track(drum_track_name)
-    # Give REAPER a moment to process the new track
-    time.sleep(0.5)
     
     # We assume the new track is the last one
     # Note: In a robust app we'd track IDs, but for now we assume sequentially added.
@@ -47,21 +52,22 @@ def main():
     # Flatten drum tracks
     drum_notes = drums.to_midi_notes()
     
-    bridge.insert_midi_item(0, position=0, length=4*4) # 4 bars
-    time.sleep(0.2)
-    bridge.add_notes(0, 0, drum_notes)
+    # Track, item and notes go to REAPER as one script
+    with bridge.batch() as results:
+        bridge.create_track(drum_track_name)
+        bridge.insert_midi_item(0, position=0, length=4*4) # 4 bars
+        bridge.add_notes(0, 0, drum_notes)
+    ok = report("Drums", results)
     
     # 3. BASS
     print("\n--- Generating Bass (Synth) ---")
-    bridge.create_track("MCP Bass")
-    time.sleep(0.5)
-    
-    # Simple progression: Cm7 - Fm7 - Gm7 - Cm7
+    # Simple progression: Cm7 - Fm7 - Gm7 - Cm7 (chords are immutable, so Cm7 is shared)
+    cm7 = parse_chord("Cm7")
     chords = [
-        parse_chord("Cm7"),
+        cm7,
         parse_chord("Fm7"),
         parse_chord("Gm7"),
-        parse_chord("Cm7")
+        cm7
     ]
     
     bass = generate_bassline(
@@ -71,15 +77,14 @@ def main():
     )
     bass_notes = bass.to_dict_list()
     
-    bridge.insert_midi_item(1, position=0, length=4*4)
-    time.sleep(0.2)
-    bridge.add_notes(1, 0, bass_notes)
+    with bridge.batch() as results:
+        bridge.create_track("MCP Bass")
+        bridge.insert_midi_item(1, position=0, length=4*4)
+        bridge.add_notes(1, 0, bass_notes)
+    ok = report("Bass", results) and ok
     
     # 4. MELODY
     print("\n--- Generating Melody (C Minor) ---")
-    bridge.create_track("MCP Melody")
-    time.sleep(0.5)
-    
     scale = Scale("C", "minor", octave=5)
     melody = generate_melody(
         scale=scale,
@@ -89,14 +94,17 @@ def main():
     )
     melody_notes = melody.to_dict_list()
     
-    bridge.insert_midi_item(2, position=0, length=4*4)
-    time.sleep(0.2)
-    bridge.add_notes(2, 0, melody_notes)
+    with bridge.batch() as results:
+        bridge.create_track("MCP Melody")
+        bridge.insert_midi_item(2, position=0, length=4*4)
+        bridge.add_notes(2, 0, melody_notes)
+    ok = report("Melody", results) and ok
     
-    print("\nDone! Check REAPER.")
+    print("\nDone! Check REAPER." if ok else "\nDone, with errors (see above).")
     print(f"Generated {len(drum_notes)} drum hits")
     print(f"Generated {len(bass_notes)} bass notes")
     print(f"Generated {len(melody_notes)} melody notes")
+    return ok
 
 if __name__ == "__main__":
-    main()
+    sys.exit(0 if main() else 1)
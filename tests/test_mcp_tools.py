@@ -1,31 +1,46 @@
-import json
 import pytest
-from scythe_mcp.server.main import generate_drums_json, generate_bass_json, generate_melody_json, mcp
+from scythe_mcp.server.main import (
+    generate_drums_json, generate_bass_json, generate_melody_json,
+    generate_drums_notes, generate_bass_notes, generate_melody_notes, _dumps_notes, mcp
+)
 
 # Mock context
 class MockContext:
-    pass
+    # The tools never read from ctx, so it carries no attributes
+    __slots__ = ()
 
-ctx = MockContext()
+@pytest.fixture(scope="module")
+def ctx():
+    return MockContext()
 
-def test_generate_drums_json():
-    """Test generating drums JSON."""
-    result = generate_drums_json(ctx, genre="electronic", bars=4)
-    data = json.loads(result)
+GENERATORS = [
+    (generate_drums_notes, generate_drums_json, dict(genre="electronic", bars=4)),
+    (generate_bass_notes, generate_bass_json, dict(progression=["Cmaj7", "G7"], style="walking")),
+    (generate_melody_notes, generate_melody_json, dict(key="D", scale_type="minor")),
+]
+IDS = ["drums", "bass", "melody"]
+
+@pytest.mark.parametrize("generate, generate_json, kwargs", GENERATORS, ids=IDS)
+def test_generate_notes(generate, generate_json, kwargs):
+    """Each generator returns a non-empty list of note dicts (no JSON round-trip)."""
+    data = generate(**kwargs)
     assert isinstance(data, list)
     assert len(data) > 0
     assert "pitch" in data[0]
 
-def test_generate_bass_json():
-    """Test generating bass JSON."""
-    result = generate_bass_json(ctx, progression=["Cmaj7", "G7"], style="walking")
-    data = json.loads(result)
-    assert isinstance(data, list)
-    assert len(data) > 0
+@pytest.mark.parametrize("generate, generate_json, kwargs", GENERATORS, ids=IDS)
+def test_generate_json_serializes_notes(ctx, generate, generate_json, kwargs):
+    """The JSON tools serialize exactly the generated notes."""
+    assert generate_json(ctx, seed=3, **kwargs) == _dumps_notes(generate(seed=3, **kwargs))
 
-def test_generate_melody_json():
-    """Test generating melody JSON."""
-    result = generate_melody_json(ctx, key="D", scale_type="minor")
-    data = json.loads(result)
-    assert isinstance(data, list)
-    assert len(data) > 0
+def test_session_info_error_is_not_cached(ctx, monkeypatch):
+    """A failed session check doesn't stick once OSC comes up."""
+    from types import SimpleNamespace
+    from scythe_mcp.server import main
+    
+    bridge = SimpleNamespace(_osc_client=None, osc_host="127.0.0.1", osc_port=8000)
+    monkeypatch.setattr(main, "get_bridge", lambda: bridge)
+    monkeypatch.setattr(main, "_session_info_text", None)
+    assert main.get_session_info(ctx).startswith("Error")
+    bridge._osc_client = object()
+    assert "Ready (127.0.0.1:8000)" in main.get_session_info(ctx)
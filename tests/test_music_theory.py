@@ -0,0 +1,69 @@
+from scythe_mcp.music_theory.scales import Scale, note_to_midi
+from scythe_mcp.music_theory.chords import parse_chord, voice_lead, voice_leading_distance
+from scythe_mcp.music_theory.progressions import get_progression
+
+
+def test_flat_spellings_resolve():
+    """Flat and sharp spellings map to the same MIDI note."""
+    assert note_to_midi("Bb") == note_to_midi("A#") == 70
+    assert note_to_midi("eb", 3) == 51
+    assert parse_chord("Bbm7").root_midi == 70
+
+
+def test_voice_leading_beats_greedy():
+    """Whole-progression voice leading never moves more than chord-by-chord."""
+    def movement(chords):
+        voicings = [chord.get_notes() for chord in chords]
+        return sum(voice_leading_distance(a, b) for a, b in zip(voicings, voicings[1:]))
+    
+    progression = get_progression("E", "jazz", "ii_v_i_vi")
+    raw_chords = progression.to_chords()
+    greedy = [raw_chords[0]]
+    for chord in raw_chords[1:]:
+        greedy.append(voice_lead(greedy[-1], chord))
+    
+    voiced = progression.with_voice_leading()
+    assert voiced[0] == raw_chords[0]
+    assert movement(voiced) <= movement(greedy)
+
+
+def test_cached_results_are_shared_and_immutable():
+    """Cached chords and progressions are returned as-is, so they can't be mutated."""
+    assert parse_chord("Cm7") is parse_chord("Cm7")
+    progression = get_progression("C", "pop", "axis")
+    assert progression is get_progression("C", "pop", "axis")
+    assert progression.chords == ("I", "V", "vi", "IV")
+    try:
+        progression.key = "D"
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("Progression should be frozen")
+
+
+def test_nearest_in_scale_snaps_up_first():
+    """Out-of-scale notes snap to the closest scale tone, preferring upward."""
+    scale = Scale("C", "major")
+    assert scale.nearest_in_scale(61) == 62
+    assert scale.nearest_in_scale(64) == 64
+    assert scale.nearest_in_scale_many([61, 63, 66, 70]) == [62, 64, 67, 71]
+
+
+def test_parse_chord_qualities():
+    """Shorthand and alias qualities resolve to canonical chord types."""
+    assert parse_chord("Dm7").chord_type == "min7"
+    assert parse_chord("F#m7b5").chord_type == "m7b5"
+    assert parse_chord("CΔ7").chord_type == "maj7"
+    assert parse_chord("Ebmmaj7").chord_type == "minmaj7"
+    assert parse_chord("Gsomething").chord_type == "major"
+
+
+def test_progression_midi_batch_is_padded():
+    """Batch rows match each chord's notes, padded to the widest chord."""
+    progression = get_progression("C", "shoegaze", "ethereal")
+    batch = progression.to_midi_batch(octave=4)
+    assert batch[0] == [60, 64, 67, 74]
+    assert batch[2] == [69, 72, 76, -1]
+    assert [[n for n in row if n != -1] for row in batch] == [
+        chord.get_notes() for chord in progression.to_chords(4)
+    ]
@@ -1,5 +1,7 @@
 import importlib
+import inspect
 import pytest
+from scythe_mcp.server import main
 from scythe_mcp.server.main import mcp
 
 def test_imports():
@@ -24,6 +26,20 @@ def test_server_instantiation():
     assert mcp is not None
     assert mcp.name == "ScytheMCP"
 
+def test_tools_registered_once():
+    """Every @mcp.tool() definition registers its own tool (no duplicate names)."""
+    decorated = inspect.getsource(main).count("@mcp.tool(")
+    assert len(mcp._tool_manager.list_tools()) == decorated
+
+def test_bridge_created_once_under_concurrency(monkeypatch):
+    """Concurrent first calls to get_bridge() all get the same bridge."""
+    from concurrent.futures import ThreadPoolExecutor
+    from scythe_mcp.server import reaper_bridge
+    monkeypatch.setattr(reaper_bridge, "_bridge", None)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        bridges = list(pool.map(lambda _: reaper_bridge.get_bridge(), range(8)))
+    assert all(bridge is bridges[0] for bridge in bridges)
+
 def test_generators_exist():
     """Verify generator functions exist."""
     from scythe_mcp.generators.drums import generate_drum_pattern